@@ -0,0 +1,162 @@
+# ===========================================
+# GENOME ARCHIVE - Hall of Fame Store
+# ===========================================
+
+import os
+import json
+import numpy as np
+from config import STORAGE_DTYPE
+from neural_network import GENOME_SIZE
+
+
+class GenomeArchive:
+    """
+    Append-only on-disk record of every generation's genomes and fitness.
+
+    Each generation is stored sorted by fitness (rank 0 = best) as raw rows
+    in genomes.bin / fitness.bin, with index.bin mapping generation ->
+    (first row, row count). Reads go through np.memmap, so any genome is
+    one O(1) lookup and nothing is loaded into RAM until it is touched.
+    Genomes are kept as the dtype recorded in meta.json (dtype, for a new
+    archive), and read back as it.
+    """
+
+    def __init__(self, directory, dtype=STORAGE_DTYPE):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        meta_path = os.path.join(directory, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if meta['genome_size'] != GENOME_SIZE:
+                raise ValueError(f"Archive holds genomes of size {meta['genome_size']}, expected {GENOME_SIZE}")
+        else:
+            meta = {'genome_size': GENOME_SIZE, 'dtype': np.dtype(dtype).name}
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+        self.dtype = np.dtype(meta['dtype'])
+
+        self._genomes_path = os.path.join(directory, 'genomes.bin')
+        self._fitness_path = os.path.join(directory, 'fitness.bin')
+        self._index_path = os.path.join(directory, 'index.bin')
+
+        self.index = {}
+        self.rows = 0
+        if os.path.exists(self._index_path):
+            entries = np.fromfile(self._index_path, dtype=np.int64)
+            entries = entries[:len(entries) // 3 * 3]
+            for generation, start, count in entries.reshape(-1, 3):
+                self.index[int(generation)] = (int(start), int(count))
+                self.rows = max(self.rows, int(start + count))
+            # Drop anything a crashed append left behind, so new rows land where the index says
+            self._truncate(self._index_path, entries.nbytes)
+        self._truncate(self._genomes_path, self.rows * GENOME_SIZE * self.dtype.itemsize)
+        self._truncate(self._fitness_path, self.rows * 8)
+
+        self._genomes = None
+        self._fitness = None
+        self._mapped_rows = 0
+
+    @staticmethod
+    def _truncate(path, size):
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            os.truncate(path, size)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, generation):
+        return generation in self.index
+
+    @property
+    def generations(self):
+        return sorted(self.index)
+
+    def append(self, generation, genomes, fitness):
+        """Store one evaluated generation; rows are written best first."""
+        if generation in self.index:
+            raise ValueError(f"Generation {generation} is already archived")
+
+        order = np.argsort(-np.asarray(fitness), kind='stable')
+        with open(self._genomes_path, 'ab') as f:
+            f.write(np.ascontiguousarray(genomes[order], dtype=self.dtype).tobytes())
+        with open(self._fitness_path, 'ab') as f:
+            f.write(np.asarray(fitness, dtype=np.float64)[order].tobytes())
+
+        # Index last, so a crash mid-append leaves the entry out rather than half in
+        # (the orphaned rows are truncated away when the archive is next opened)
+        with open(self._index_path, 'ab') as f:
+            f.write(np.array([generation, self.rows, len(order)], dtype=np.int64).tobytes())
+
+        self.index[generation] = (self.rows, len(order))
+        self.rows += len(order)
+
+    def truncate(self, generation):
+        """
+        Forget generation and every generation archived after it, e.g. the
+        ones a run went on to archive after the checkpoint it is resumed
+        from. Returns the dropped generation numbers.
+        """
+        dropped = [g for g in self.index if g >= generation]
+        if not dropped:
+            return []
+        rows = min(self.index[g][0] for g in dropped)
+        kept = [(g, start, count) for g, (start, count) in self.index.items() if g < generation]
+        if any(start + count > rows for _, start, count in kept):
+            raise ValueError(f"Generations from {generation} on are not the last ones archived")
+
+        # New index first: a crash before the data files are cut only leaves orphaned rows
+        temp = self._index_path + '.tmp'
+        np.array(kept, dtype=np.int64).reshape(-1, 3).tofile(temp)
+        os.replace(temp, self._index_path)
+        self._genomes = self._fitness = None
+        self._mapped_rows = 0
+        self._truncate(self._genomes_path, rows * GENOME_SIZE * self.dtype.itemsize)
+        self._truncate(self._fitness_path, rows * 8)
+
+        for g in dropped:
+            del self.index[g]
+        self.rows = rows
+        return sorted(dropped)
+
+    def _map(self):
+        # Re-map only when rows were appended since the last read
+        if self._mapped_rows != self.rows:
+            self._genomes = np.memmap(self._genomes_path, dtype=self.dtype, mode='r',
+                                      shape=(self.rows, GENOME_SIZE))
+            self._fitness = np.memmap(self._fitness_path, dtype=np.float64, mode='r',
+                                      shape=(self.rows,))
+            self._mapped_rows = self.rows
+
+    def generation(self, generation):
+        """(genomes, fitness) of one generation, best first, as read-only memmaps."""
+        start, count = self.index[generation]
+        self._map()
+        return self._genomes[start:start + count], self._fitness[start:start + count]
+
+    def get(self, generation, rank=0):
+        """Genome and fitness of the bird with the given rank in a generation."""
+        start, count = self.index[generation]
+        if not 0 <= rank < count:
+            raise IndexError(f"Generation {generation} has {count} genomes")
+        self._map()
+        return np.array(self._genomes[start + rank]), float(self._fitness[start + rank])
+
+    def hall_of_fame(self, count=10):
+        """
+        The count fittest genomes ever archived as (genomes, fitness,
+        generations), best first. Only the fitness file is scanned.
+        """
+        if self.rows == 0:
+            return np.empty((0, GENOME_SIZE), dtype=self.dtype), np.empty(0), np.empty(0, dtype=np.int64)
+        self._map()
+        count = min(count, self.rows)
+        top = np.argpartition(-self._fitness, count - 1)[:count]
+        top = top[np.argsort(-self._fitness[top], kind='stable')]
+
+        starts = sorted((start, generation) for generation, (start, _) in self.index.items())
+        start_rows = np.array([start for start, _ in starts])
+        owners = np.array([generation for _, generation in starts])
+        generations = owners[np.searchsorted(start_rows, top, side='right') - 1]
+        return np.array(self._genomes[top]), np.array(self._fitness[top]), generations
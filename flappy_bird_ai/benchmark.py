@@ -0,0 +1,308 @@
+# ===========================================
+# BENCHMARKS - Hot Path Throughput
+# ===========================================
+
+import sys
+import json
+import time
+import argparse
+import platform
+import numpy as np
+from config import *
+from bird import Bird
+from pipe import PipeManager
+from population import Population
+from neural_network import NeuralNetwork, BatchedNetwork, random_genomes
+from genetic_algorithm import GeneticAlgorithm
+from simulator import Simulator, Trainer
+from selection import SELECTIONS
+from sensors import SensorPipeline
+
+SEED = 1234
+
+
+def measure(func, min_time):
+    """Average seconds per call of func, repeating it for at least min_time."""
+    func()  # Warm up
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def _genomes(size):
+    return random_genomes(size, np.random.RandomState(SEED))
+
+
+def _pipes_near_birds():
+    # Run the course until a pipe is overlapping the birds' column
+    pipes = PipeManager(SEED)
+    while not ((pipes.x < BIRD_X + BIRD_RADIUS) & (pipes.x + PIPE_WIDTH > BIRD_X - BIRD_RADIUS)).any():
+        pipes.update()
+    return pipes
+
+
+def _reset(population):
+    population.y[:] = SCREEN_HEIGHT // 2
+    population.velocity[:] = 0
+    population.alive[:] = True
+
+
+def _reset_birds(birds):
+    for bird in birds:
+        bird.y = SCREEN_HEIGHT // 2
+        bird.velocity = 0
+        bird.alive = True
+
+
+# Each benchmark takes a population size and returns (function to time,
+# items processed per call). Items are forward passes, bird updates,
+# genomes, ... so results are comparable across sizes.
+
+def bench_forward(size):
+    brain = NeuralNetwork(_genomes(1)[0])
+    inputs = np.random.RandomState(SEED).rand(INPUT_SIZE)
+    return (lambda: brain.forward(inputs)), 1
+
+
+def bench_forward_batch(size):
+    network = BatchedNetwork(_genomes(size))
+    inputs = np.random.RandomState(SEED).rand(size, INPUT_SIZE)
+    return (lambda: network.forward(inputs)), size
+
+
+def bench_forward_batch_dtype(dtype):
+    def bench(size):
+        network = BatchedNetwork(_genomes(size).astype(dtype))
+        inputs = np.random.RandomState(SEED).rand(size, INPUT_SIZE)
+        return (lambda: network.forward(inputs)), size
+    return bench
+
+
+def bench_bird_think(size):
+    birds = [Bird(neural_network=NeuralNetwork(row)) for row in _genomes(size)]
+    pipes = _pipes_near_birds().pipes
+
+    def run():
+        _reset_birds(birds)
+        # Pipe sensors are looked up once per tick, as in a game loop
+        frame = SensorPipeline().pipes_frame(pipes)
+        for bird in birds:
+            bird.think(pipes, frame)
+    return run, size
+
+
+def bench_bird_update(size):
+    birds = [Bird(neural_network=NeuralNetwork(row)) for row in _genomes(size)]
+
+    def run():
+        _reset_birds(birds)
+        for bird in birds:
+            bird.update()
+    return run, size
+
+
+def bench_population_think(size):
+    population = Population(_genomes(size))
+    pipes = _pipes_near_birds()
+    frame = population.sensors.pipe_frame(pipes.x, pipes.gap_top, pipes.gap_bottom)
+
+    def run():
+        _reset(population)
+        population.think(frame)
+    return run, size
+
+
+def bench_population_update(size):
+    population = Population(_genomes(size))
+
+    def run():
+        _reset(population)
+        population.update()
+    return run, size
+
+
+def bench_check_collisions(size):
+    population = Population(_genomes(size))
+    population.y[:] = np.random.RandomState(SEED).uniform(0, SCREEN_HEIGHT - 50, size)
+    pipes = _pipes_near_birds()
+
+    def run():
+        population.alive[:] = True
+        pipes.check_collisions(population)
+    return run, size
+
+
+def bench_check_passed(size):
+    population = Population(_genomes(size))
+    pipes = _pipes_near_birds()
+    pipes.x[0] = BIRD_X - PIPE_WIDTH - 1
+
+    def run():
+        pipes.passed[:] = False
+        pipes.check_passed(population)
+    return run, size
+
+
+def bench_simulator_step(size):
+    # One full tick: think, physics, pipes, collisions and scoring
+    simulator = Simulator(Population(_genomes(size)), PipeManager(SEED))
+
+    def run():
+        if simulator.step() == 0:
+            simulator.reset(Population(simulator.population.genomes), SEED)
+    return run, 1
+
+
+def bench_evolve(size):
+    ga = GeneticAlgorithm(SEED, population_size=size)
+    genomes = _genomes(size)
+    fitness = np.random.RandomState(SEED).randint(0, 5000, size)
+    return (lambda: ga.evolve(genomes, fitness)), size
+
+
+def bench_create_next_generation(size):
+    ga = GeneticAlgorithm(SEED, population_size=size)
+    birds = ga.create_initial_population(Bird)
+    for bird, fitness in zip(birds, np.random.RandomState(SEED).randint(0, 5000, size)):
+        bird.fitness = int(fitness)
+    return (lambda: ga.create_next_generation(birds, Bird)), size
+
+
+def bench_selection(name):
+    def bench(size):
+        fitness = np.random.RandomState(SEED).randint(0, 5000, size)
+        rng = np.random.RandomState(SEED)
+        return (lambda: SELECTIONS[name](fitness, size, rng)), size
+    return bench
+
+
+def bench_generation(size, max_ticks=500, jit=False):
+    # Whole generations, headless, capped so good birds cannot run forever.
+    # Every call rewinds to the same seeded first generation: left to evolve,
+    # later calls would time ever better (and longer-lived) populations
+    trainer = Trainer(GeneticAlgorithm(SEED, population_size=size), seed=SEED, jit=jit)
+    genomes = trainer.simulator.population.genomes.copy()
+    course_state = trainer.rng.getstate()
+    ga_state = trainer.ga.rng.get_state()
+
+    def generation():
+        trainer.rng.setstate(course_state)
+        trainer.ga.rng.set_state(ga_state)
+        trainer.simulator.reset(Population(genomes.copy()))
+        trainer.run_generation(max_ticks, None)
+
+    return generation, 1
+
+
+def bench_generation_jit(size):
+    # The same generations through the compiled kernel (NumPy without numba)
+    return bench_generation(size, jit=True)
+
+
+BENCHMARKS = {
+    'network.forward': bench_forward,
+    'network.forward_batch': bench_forward_batch,
+    'bird.think': bench_bird_think,
+    'bird.update': bench_bird_update,
+    'population.think': bench_population_think,
+    'population.update': bench_population_update,
+    'pipes.check_collisions': bench_check_collisions,
+    'pipes.check_passed': bench_check_passed,
+    'simulator.step': bench_simulator_step,
+    'ga.evolve': bench_evolve,
+    'ga.create_next_generation': bench_create_next_generation,
+    'trainer.generation': bench_generation,
+    'trainer.generation_jit': bench_generation_jit,
+}
+for _name in SELECTIONS:
+    BENCHMARKS[f'selection.{_name}'] = bench_selection(_name)
+for _dtype in ('float64', 'float32', 'float16'):
+    BENCHMARKS[f'network.forward_batch.{_dtype}'] = bench_forward_batch_dtype(_dtype)
+
+# What items_per_second counts (birds unless listed here)
+UNITS = {
+    'network.forward': 'forward passes',
+    'network.forward_batch': 'forward passes',
+    'network.forward_batch.float64': 'forward passes',
+    'network.forward_batch.float32': 'forward passes',
+    'network.forward_batch.float16': 'forward passes',
+    'simulator.step': 'ticks',
+    'ga.evolve': 'genomes',
+    'ga.create_next_generation': 'genomes',
+    'trainer.generation': 'generations',
+    'trainer.generation_jit': 'generations',
+}
+
+# Benchmarks whose cost does not depend on the population size
+SIZE_INDEPENDENT = {'network.forward'}
+
+
+def run_benchmarks(names, sizes, min_time, report=None):
+    results = []
+    for name in names:
+        for size in (sizes[:1] if name in SIZE_INDEPENDENT else sizes):
+            func, items = BENCHMARKS[name](size)
+            seconds = measure(func, min_time)
+            result = {
+                'benchmark': name,
+                'population': size,
+                'seconds_per_call': seconds,
+                'calls_per_second': 1 / seconds,
+                'items_per_second': items / seconds,
+                'unit': UNITS.get(name, 'birds')
+            }
+            results.append(result)
+            if report is not None:
+                report(result)
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the simulation, inference and evolution hot paths")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000],
+                        help="population sizes to benchmark")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help="benchmarks to run")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="seconds to repeat each measurement for")
+    parser.add_argument("--output", default=None,
+                        help="write results as JSON to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    def report(result):
+        print(f"{result['benchmark']:<28} n={result['population']:<7} "
+              f"{result['seconds_per_call'] * 1e3:10.3f} ms/call "
+              f"{result['items_per_second']:14,.0f} {result['unit']}/s", file=sys.stderr)
+
+    results = run_benchmarks(args.only, args.sizes, args.min_time, report)
+    document = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'seed': SEED,
+        'genome_dtype': GENOME_DTYPE,
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,11 @@
 # BIRD CLASS - The AI Agent
 # ===========================================
 
-import pygame
 from config import *
 from neural_network import NeuralNetwork
+from sensors import SensorPipeline
+
+_sensors = SensorPipeline()
 
 class Bird:
     def __init__(self, neural_network=None):
@@ -49,40 +51,23 @@ class Bird:
         if not self.alive:
             return
         
-        color = ORANGE if is_best else YELLOW
-        pygame.draw.circle(screen, color, (int(self. x), int(self.y)), BIRD_RADIUS)
-        
-        # Eye
-        eye_x = int(self.x + 5)
-        eye_y = int(self.y - 3)
-        pygame.draw.circle(screen, WHITE, (eye_x, eye_y), 5)
-        pygame.draw.circle(screen, BLACK, (eye_x + 2, eye_y), 2)
-        
-        # Beak
-        beak_rect = pygame.Rect(self.x + BIRD_RADIUS - 2, self.y + 2, 10, 5)
-        pygame.draw.rect(screen, ORANGE if not is_best else RED, beak_rect)
+        # Body, eye and beak are pre-rendered once; pygame is only needed to draw
+        from sprites import bird_sprite, bird_position
+        screen.blit(bird_sprite(is_best), bird_position(self.x, self.y))
     
-    def think(self, pipes):
+    def think(self, pipes, frame=None):
+        # frame: the tick's pipe sensors (sensors.py), when the caller has
+        # already worked them out once for every bird
         if self.brain is None or not self.alive:
             return
         
-        # Find next pipe
-        next_pipe = None
-        for pipe in pipes: 
-            if pipe.x + PIPE_WIDTH > self.x:
-                next_pipe = pipe
-                break
-        
-        if next_pipe is None:
+        if frame is None:
+            frame = _sensors.pipes_frame(pipes)
+        if frame is None:
             return
         
         # Neural network inputs
-        inputs = [
-            self.y / SCREEN_HEIGHT,
-            next_pipe.gap_top / SCREEN_HEIGHT,
-            next_pipe.gap_bottom / SCREEN_HEIGHT,
-            (self.velocity + 10) / 20
-        ]
+        inputs = _sensors.bird_inputs(self.y, self.velocity, frame)
         
         output = self.brain.forward(inputs)
         
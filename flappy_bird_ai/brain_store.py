@@ -0,0 +1,62 @@
+# ===========================================
+# BRAIN STORE - Background File I/O
+# ===========================================
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from neural_network import NeuralNetwork
+from checkpoint import checkpoint_data, write_checkpoint
+
+
+class BrainStore:
+    """
+    Saves and loads brains and checkpoints on one background thread, so
+    the game loop never waits on the disk. Everything is snapshotted
+    before it is handed over, and loaded brains are cached by file and
+    modification time: loading a file that has not changed does not
+    read it again.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='brain-store')
+        self.cache = {}   # path -> (mtime, NeuralNetwork)
+
+    def _submit(self, func, *args):
+        future = self.executor.submit(func, *args)
+        future.add_done_callback(_report_error)
+        return future
+
+    def save(self, brain, filename):
+        return self._submit(self._save, brain.copy(), filename)
+
+    def _save(self, brain, filename):
+        brain.save(filename)
+        self.cache[filename] = (os.stat(filename).st_mtime_ns, brain)
+        return brain
+
+    def load(self, filename):
+        """Future of the brain in filename; fails with FileNotFoundError if there is none."""
+        return self._submit(self._load, filename)
+
+    def _load(self, filename):
+        mtime = os.stat(filename).st_mtime_ns
+        cached = self.cache.get(filename)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        brain = NeuralNetwork.load(filename)
+        self.cache[filename] = (mtime, brain)
+        return brain
+
+    def save_checkpoint(self, filename, ga, genomes, **kwargs):
+        # The snapshot is taken now, the file is written in the background
+        return self._submit(write_checkpoint, filename, checkpoint_data(ga, genomes, **kwargs))
+
+    def close(self):
+        """Wait for queued saves to finish."""
+        self.executor.shutdown(wait=True)
+
+
+def _report_error(future):
+    error = future.exception()
+    if error is not None and not isinstance(error, FileNotFoundError):
+        print(f"Background I/O failed: {error}")
@@ -0,0 +1,115 @@
+# ===========================================
+# CHECKPOINTS - Save and Resume Training
+# ===========================================
+
+import os
+import json
+import random
+import numpy as np
+from config import GENOME_DTYPE, STORAGE_DTYPE
+from genetic_algorithm import GeneticAlgorithm
+from neural_network import GENOME_SIZE
+
+
+def _numpy_rng_state(rng):
+    name, keys, pos, has_gauss, cached_gaussian = rng.get_state()
+    return keys, np.array([pos, has_gauss], dtype=np.int64), np.array(cached_gaussian)
+
+
+def _python_rng_state(rng):
+    version, internal, gauss_next = rng.getstate()
+    return np.array(internal, dtype=np.int64), np.array(np.nan if gauss_next is None else gauss_next)
+
+
+def save_checkpoint(filename, ga, genomes, champion=None, champion_fitness=None, course_rng=None):
+    """
+    Write the whole training state to one binary .npz file: the genome
+    matrix of the generation about to be evaluated, the GA's generation
+    counter, histories and RNG state, the champion and (optionally) the
+    random.Random that generates pipe courses. The file is written next
+    to its destination and then moved into place, so a crash never
+    leaves a half-written checkpoint behind. Genomes are stored as
+    STORAGE_DTYPE, so a resumed run only continues bit for bit when that
+    is GENOME_DTYPE; the champion is kept at full precision.
+    """
+    write_checkpoint(filename, checkpoint_data(ga, genomes, champion, champion_fitness, course_rng))
+
+
+def checkpoint_data(ga, genomes, champion=None, champion_fitness=None, course_rng=None):
+    """
+    Snapshot of the training state as the arrays save_checkpoint writes.
+    Nothing in it is shared with the live run, so it can be written later
+    (or from another thread) while training carries on.
+    """
+    keys, counters, gaussian = _numpy_rng_state(ga.rng)
+    data = {
+        'genomes': np.array(genomes, dtype=STORAGE_DTYPE),
+        'generation': np.array(ga.generation),
+        'best_fitness_history': np.array(ga.best_fitness_history, dtype=np.float64),
+        'avg_fitness_history': np.array(ga.avg_fitness_history, dtype=np.float64),
+        'termination_history': np.array(ga.termination_history, dtype=str),
+        'selection': np.array(ga.selection_method),
+        'selection_options': np.array(json.dumps(ga.selection_options)),
+        'ga_rng_keys': keys,
+        'ga_rng_counters': counters,
+        'ga_rng_gaussian': gaussian,
+    }
+    if champion is not None:
+        data['champion'] = np.array(champion)
+        data['champion_fitness'] = np.array(champion_fitness)
+    if course_rng is not None:
+        data['course_rng_state'], data['course_rng_gauss'] = _python_rng_state(course_rng)
+    return data
+
+
+def write_checkpoint(filename, data):
+    temp = filename + '.tmp'
+    with open(temp, 'wb') as f:
+        np.savez(f, **data)
+    os.replace(temp, filename)
+
+
+def load_checkpoint(filename, seeded=True):
+    """
+    Read a checkpoint written by save_checkpoint. Returns a dict with the
+    restored GeneticAlgorithm ('ga'), the 'genomes' to evaluate next, the
+    'champion' and 'champion_fitness' (None if absent) and the restored
+    'course_rng' (None if absent). With seeded=False the GA's RNG state
+    is loaded into the global np.random instead of a private RandomState.
+    Genomes come back as GENOME_DTYPE whatever they were stored as.
+    """
+    with np.load(filename) as data:
+        if data['genomes'].shape[-1] != GENOME_SIZE:
+            raise ValueError(f"Checkpoint holds genomes of size {data['genomes'].shape[-1]}, expected {GENOME_SIZE} "
+                             "(was it saved with other HIDDEN_LAYERS?)")
+        ga = GeneticAlgorithm(0 if seeded else None)
+        ga.generation = int(data['generation'])
+        ga.best_fitness_history = [_plain(v) for v in data['best_fitness_history']]
+        ga.avg_fitness_history = data['avg_fitness_history'].tolist()
+        ga.termination_history = data['termination_history'].tolist()
+        if 'selection' in data:
+            ga.selection_method = str(data['selection'])
+            ga.selection_options = json.loads(str(data['selection_options']))
+
+        pos, has_gauss = data['ga_rng_counters'].tolist()
+        ga.rng.set_state(('MT19937', data['ga_rng_keys'], pos, has_gauss, float(data['ga_rng_gaussian'])))
+
+        course_rng = None
+        if 'course_rng_state' in data:
+            gauss = float(data['course_rng_gauss'])
+            course_rng = random.Random()
+            course_rng.setstate((3, tuple(data['course_rng_state'].tolist()), None if np.isnan(gauss) else gauss))
+
+        return {
+            'ga': ga,
+            'genomes': data['genomes'].astype(GENOME_DTYPE),
+            'champion': data['champion'].astype(GENOME_DTYPE) if 'champion' in data else None,
+            'champion_fitness': _plain(data['champion_fitness']) if 'champion_fitness' in data else None,
+            'course_rng': course_rng,
+        }
+
+
+def _plain(value):
+    # Fitness values are whole numbers; keep them as ints like the live histories
+    value = float(value)
+    return int(value) if value.is_integer() else value
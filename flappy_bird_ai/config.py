@@ -7,6 +7,11 @@ SCREEN_WIDTH = 600
 SCREEN_HEIGHT = 600
 FPS = 60
 
+# Rendering
+RENDER_FPS = 30     # frame rate of the unlimited speed mode
+DRAWN_BIRDS = 10    # birds drawn when only the best are shown
+MAX_FRAME_TIME = 0.25   # longest stall (seconds) the simulation catches up on
+
 # Colors (RGB)
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -32,8 +37,28 @@ PIPE_SPAWN_RATE = 90
 POPULATION_SIZE = 100
 MUTATION_RATE = 0.1
 MUTATION_STRENGTH = 0.5
+SELECTION = 'truncation'   # truncation, tournament, rank, roulette or sus (see selection.py)
+
+# Evaluation budget (None = no limit)
+MAX_TICKS_PER_GENERATION = None   # end a generation after this many ticks
+MAX_PIPES_PER_GENERATION = None   # end a generation once a bird passes this many pipes
+PLATEAU_GENERATIONS = None        # stop training when the best fitness stalls this long
+SOLVED_SCORE = None               # stop training and save the champion at this score
+
+# Multi-course evaluation (headless training)
+EVALUATION_COURSES = 1      # seeded courses every genome flies each generation
+FITNESS_AGGREGATE = 'mean'  # how course results combine: mean, min or quantile
+FITNESS_QUANTILE = 0.25     # the quantile used by FITNESS_AGGREGATE = 'quantile'
 
 # Neural Network settings
-INPUT_SIZE = 4
+SENSORS = ['y', 'gap_top', 'gap_bottom', 'velocity']   # network inputs, in order (see sensors.py)
+INPUT_SIZE = len(SENSORS)
 HIDDEN_SIZE = 8
-OUTPUT_SIZE = 1
\ No newline at end of file
+OUTPUT_SIZE = 1
+HIDDEN_LAYERS = [HIDDEN_SIZE]   # sizes of the hidden layers, e.g. [16, 8] for two
+HIDDEN_ACTIVATION = 'relu'      # relu, tanh, sigmoid or linear (one name, or one per hidden layer)
+OUTPUT_ACTIVATION = 'sigmoid'   # a bird flaps when its first output is above 0.5
+
+# Numeric precision of the genomes (see precision.py to compare)
+GENOME_DTYPE = 'float32'    # genomes and network arithmetic while training: float64, float32 or float16
+STORAGE_DTYPE = 'float16'   # genomes written to checkpoints and archives
@@ -0,0 +1,113 @@
+# ===========================================
+# EQUIVALENCE - Fast Paths vs Simulator
+# ===========================================
+
+import sys
+import random
+import argparse
+import numpy as np
+from config import GENOME_DTYPE
+from population import Population
+from pipe import PipeManager
+from simulator import Simulator, FastForwardSimulator, Trainer
+from multi_course import CourseBatch
+
+# (max_ticks, max_pipes) budgets every path is checked under
+BUDGETS = [(20000, None), (2000, None), (None, 5)]
+
+
+def _result(simulator):
+    population = simulator.population
+    return population.fitness, population.score, population.alive, simulator.ticks, simulator.termination
+
+
+def _same(a, b):
+    return all(np.array_equal(x, y) for x, y in zip(a, b))
+
+
+def reference(genomes, seed, max_ticks, max_pipes):
+    simulator = Simulator(Population(genomes.copy()), PipeManager(seed))
+    simulator.run(max_ticks, max_pipes)
+    return _result(simulator)
+
+
+def check_fast_forward(genomes, seed, max_ticks, max_pipes):
+    simulator = FastForwardSimulator(Population(genomes.copy()), PipeManager(seed), decision_interval=1)
+    simulator.run(max_ticks, max_pipes)
+    return _same(_result(simulator), reference(genomes, seed, max_ticks, max_pipes))
+
+
+def check_jit(genomes, seed, max_ticks, max_pipes):
+    from jit_simulator import JitSimulator
+    simulator = JitSimulator(Population(genomes.copy()), PipeManager(seed))
+    simulator.run(max_ticks, max_pipes)
+    return _same(_result(simulator), reference(genomes, seed, max_ticks, max_pipes))
+
+
+def check_courses(genomes, seeds, max_ticks, max_pipes):
+    batch = CourseBatch(genomes.copy(), seeds)
+    batch.run(max_ticks, max_pipes)
+    for e, seed in enumerate(seeds):
+        fitness, score, _, _, termination = reference(genomes, seed, max_ticks, max_pipes)
+        if not (np.array_equal(batch.fitness[e], fitness) and np.array_equal(batch.score[e], score)
+                and batch.finished[e] == termination):
+            return False
+    return True
+
+
+def run_checks(genomes, seeds, report=print):
+    """
+    Compare every fast path with Simulator.run on the given genomes and
+    course seeds, under each of BUDGETS: the compiled kernel (if numba is
+    installed), FastForwardSimulator with decision_interval=1 and a
+    CourseBatch over all seeds. Returns the number of mismatches.
+    """
+    from jit_simulator import JIT_AVAILABLE, KERNEL_DTYPES
+    checks = [('fast-forward (interval 1)', check_fast_forward)]
+    if JIT_AVAILABLE and genomes.dtype in KERNEL_DTYPES:
+        checks.append(('jit', check_jit))
+    else:
+        report(f"  jit: skipped (numba missing or no {genomes.dtype} kernel)")
+
+    failures = 0
+    for max_ticks, max_pipes in BUDGETS:
+        budget = f"max_ticks={max_ticks} max_pipes={max_pipes}"
+        for name, check in checks:
+            bad = [seed for seed in seeds if not check(genomes, seed, max_ticks, max_pipes)]
+            failures += len(bad)
+            report(f"  {name:<26} {budget:<32} " + (f"MISMATCH on seeds {bad}" if bad else "ok"))
+        same = check_courses(genomes, seeds, max_ticks, max_pipes)
+        failures += not same
+        report(f"  {'courses':<26} {budget:<32} " + ("ok" if same else "MISMATCH"))
+    return failures
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check that the fast simulation paths match Simulator exactly")
+    parser.add_argument("--generations", type=int, default=15,
+                        help="generations to train first, so some birds live long")
+    parser.add_argument("--courses", type=int, default=3,
+                        help="seeded courses to compare on")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for training and the courses")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    trainer = Trainer(seed=args.seed)
+    trainer.train(args.generations, max_pipes=5)
+    genomes = trainer.simulator.population.genomes
+    rng = random.Random(args.seed)
+    seeds = [rng.randrange(2 ** 32) for _ in range(args.courses)]
+
+    failures = 0
+    for dtype in dict.fromkeys([np.dtype(GENOME_DTYPE).name, 'float64']):
+        print(f"{len(genomes)} genomes as {dtype}, {args.generations} trained generations:")
+        failures += run_checks(genomes.astype(dtype), seeds)
+    print("All paths match Simulator" if failures == 0 else f"{failures} mismatches")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
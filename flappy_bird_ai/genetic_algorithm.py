@@ -3,95 +3,101 @@
 # ===========================================
 
 import numpy as np
-import random
-from neural_network import NeuralNetwork
-from config import POPULATION_SIZE, MUTATION_RATE, MUTATION_STRENGTH
+from neural_network import NeuralNetwork, GENOME_SIZE, random_genomes
+from config import POPULATION_SIZE, MUTATION_RATE, MUTATION_STRENGTH, SELECTION
+from selection import SELECTIONS, top_k
 
 class GeneticAlgorithm: 
-    def __init__(self):
+    def __init__(self, seed=None, population_size=POPULATION_SIZE, selection=SELECTION, **selection_options):
+        # A private RandomState when seeded, otherwise the global np.random
+        self.rng = np.random.RandomState(seed) if seed is not None else np.random
+        self.population_size = population_size
+        if selection not in SELECTIONS:
+            raise ValueError(f"Unknown selection {selection!r}, choose from {', '.join(SELECTIONS)}")
+        # Parent selection operator and its keyword options (e.g. size for tournament)
+        self.selection_method = selection
+        self.selection_options = selection_options
         self.generation = 1
         self.best_fitness_history = []
         self.avg_fitness_history = []
+        # Why each generation ended: 'extinct' (natural death) or the budget that capped it
+        self.termination_history = []
+    
+    def create_initial_genomes(self):
+        return random_genomes(self.population_size, self.rng)
     
     def create_initial_population(self, Bird):
-        return [Bird() for _ in range(POPULATION_SIZE)]
+        return [Bird(neural_network=NeuralNetwork(row)) for row in self.create_initial_genomes()]
     
     def calculate_fitness(self, birds):
         return sorted(birds, key=lambda b: b.fitness, reverse=True)
     
     def selection(self, birds, num_parents=10):
-        sorted_birds = self.calculate_fitness(birds)
-        return sorted_birds[:num_parents]
+        fitness = np.array([b.fitness for b in birds])
+        return [birds[i] for i in top_k(fitness, num_parents)]
+    
+    def select(self, fitness, count):
+        """(parent_a, parent_b) population indices for count children."""
+        return SELECTIONS[self.selection_method](fitness, count, self.rng, **self.selection_options)
     
     def crossover(self, parent_a, parent_b):
-        child = NeuralNetwork()
-        
-        mask = np.random.rand(*parent_a.weights_input_hidden.shape) > 0.5
-        child. weights_input_hidden = np.where(mask, parent_a.weights_input_hidden, parent_b.weights_input_hidden)
-        
-        mask = np.random.rand(*parent_a.bias_hidden.shape) > 0.5
-        child.bias_hidden = np.where(mask, parent_a.bias_hidden, parent_b.bias_hidden)
-        
-        mask = np. random.rand(*parent_a. weights_hidden_output.shape) > 0.5
-        child.weights_hidden_output = np.where(mask, parent_a.weights_hidden_output, parent_b.weights_hidden_output)
-        
-        mask = np.random.rand(*parent_a.bias_output.shape) > 0.5
-        child. bias_output = np.where(mask, parent_a.bias_output, parent_b.bias_output)
-        
-        return child
+        mask = self.rng.rand(GENOME_SIZE) > 0.5
+        return NeuralNetwork(np.where(mask, parent_a.params, parent_b.params))
     
     def mutate(self, brain):
-        mutation_mask = np.random.rand(*brain.weights_input_hidden.shape) < MUTATION_RATE
-        mutations = np.random.randn(*brain.weights_input_hidden.shape) * MUTATION_STRENGTH
-        brain.weights_input_hidden += mutation_mask * mutations
-        
-        mutation_mask = np.random. rand(*brain.bias_hidden. shape) < MUTATION_RATE
-        mutations = np.random. randn(*brain.bias_hidden.shape) * MUTATION_STRENGTH
-        brain.bias_hidden += mutation_mask * mutations
-        
-        mutation_mask = np. random.rand(*brain.weights_hidden_output.shape) < MUTATION_RATE
-        mutations = np.random.randn(*brain.weights_hidden_output.shape) * MUTATION_STRENGTH
-        brain.weights_hidden_output += mutation_mask * mutations
-        
-        mutation_mask = np. random.rand(*brain.bias_output.shape) < MUTATION_RATE
-        mutations = np. random.randn(*brain.bias_output.shape) * MUTATION_STRENGTH
-        brain.bias_output += mutation_mask * mutations
+        mutation_mask = self.rng.rand(GENOME_SIZE) < MUTATION_RATE
+        mutations = self.rng.randn(GENOME_SIZE) * MUTATION_STRENGTH
+        brain.params += mutation_mask * mutations
     
-    def create_next_generation(self, birds, Bird):
-        sorted_birds = self.calculate_fitness(birds)
-        best_fitness = sorted_birds[0].fitness
-        avg_fitness = sum(b.fitness for b in birds) / len(birds)
+    def evolve(self, genomes, fitness, termination='extinct'):
+        """
+        Build the next generation's genome matrix from this generation's
+        genomes (population, GENOME_SIZE) and fitness vector. Crossover and
+        mutation run once over the whole offspring matrix. termination
+        records how the evaluated generation ended.
+        """
+        # Only the top 2 are ordered, no full sort of the population
+        elites = top_k(fitness, 2)
         
-        self.best_fitness_history.append(best_fitness)
-        self.avg_fitness_history.append(avg_fitness)
+        self.best_fitness_history.append(fitness[elites[0]].item())
+        self.avg_fitness_history.append(fitness.mean().item())
+        self.termination_history.append(termination)
         
-        parents = self.selection(birds, num_parents=10)
-        new_birds = []
+        new_genomes = np.empty((self.population_size, GENOME_SIZE), dtype=genomes.dtype)
         
         # Elitism:  keep best 2 unchanged
-        best_brain = parents[0].brain.copy()
-        new_birds.append(Bird(neural_network=best_brain))
-        
-        if len(parents) > 1:
-            second_best_brain = parents[1].brain. copy()
-            new_birds. append(Bird(neural_network=second_best_brain))
+        num_elites = len(elites)
+        new_genomes[:num_elites] = genomes[elites]
         
         # Create rest through crossover + mutation
-        while len(new_birds) < POPULATION_SIZE:
-            parent_a = random.choice(parents[: 5])
-            parent_b = random.choice(parents)
-            
-            child_brain = self.crossover(parent_a.brain, parent_b.brain)
-            self.mutate(child_brain)
-            
-            new_birds. append(Bird(neural_network=child_brain))
+        children = new_genomes[num_elites:]
+        num_children = len(children)
+        parent_a, parent_b = self.select(fitness, num_children)
+        
+        mask = self.rng.rand(num_children, GENOME_SIZE) > 0.5
+        np.copyto(children, genomes[parent_b])
+        np.copyto(children, genomes[parent_a], where=mask)
+        
+        mutation_mask = self.rng.rand(num_children, GENOME_SIZE) < MUTATION_RATE
+        mutations = self.rng.randn(num_children, GENOME_SIZE)
+        mutations *= MUTATION_STRENGTH
+        mutations *= mutation_mask
+        children += mutations
         
         self.generation += 1
-        return new_birds
+        return new_genomes
+    
+    def create_next_generation(self, birds, Bird):
+        genomes = np.stack([b.brain.params for b in birds])
+        fitness = np.array([b.fitness for b in birds])
+        new_genomes = self.evolve(genomes, fitness)
+        return [Bird(neural_network=NeuralNetwork(row)) for row in new_genomes]
     
     def get_stats(self):
         return {
             'generation': self.generation,
             'best_fitness_history': self.best_fitness_history,
-            'avg_fitness_history': self.avg_fitness_history
+            'avg_fitness_history': self.avg_fitness_history,
+            'termination_history': self.termination_history,
+            'capped_generations': sum(1 for t in self.termination_history if t != 'extinct')
         }
\ No newline at end of file
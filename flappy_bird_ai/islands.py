@@ -0,0 +1,186 @@
+# ===========================================
+# ISLAND MODEL - Parallel Sub-Populations
+# ===========================================
+
+import random
+import queue
+import traceback
+import multiprocessing
+import numpy as np
+from config import SELECTION
+from genetic_algorithm import GeneticAlgorithm
+from population import Population
+from simulator import create_simulator
+
+
+def _receive(inbox):
+    # Take whatever has arrived without waiting for the neighbour
+    latest = None
+    while True:
+        try:
+            latest = inbox.get_nowait()
+        except queue.Empty:
+            return latest
+
+
+def _run_island(index, seed, generations, migration_interval, migrants,
+                inbox, outbox, results, stop, max_ticks, max_pipes, plateau, solved_score,
+                decision_interval, selection, jit):
+    try:
+        rng = random.Random(seed)
+        ga = GeneticAlgorithm(rng.randrange(2 ** 32), selection=selection)
+        simulator = create_simulator(Population(ga.create_initial_genomes()), decision_interval=decision_interval,
+                                     jit=jit)
+        best_genome, best_fitness = None, None
+        stop_reason = 'generations'
+        stalled = 0
+
+        for generation in range(generations):
+            # Another island solved the game
+            if stop.is_set():
+                stop_reason = 'solved'
+                break
+
+            simulator.pipe_manager.reset(rng.randrange(2 ** 32))
+            simulator.run(max_ticks, max_pipes)
+            population = simulator.population
+            order = np.argsort(-population.fitness, kind='stable')
+
+            improved = best_fitness is None or population.fitness[order[0]] > best_fitness
+            if improved:
+                best_fitness = int(population.fitness[order[0]])
+                best_genome = population.genomes[order[0]].copy()
+
+            best_score = int(population.score.max())
+            results.put(('generation', index, {
+                'generation': ga.generation,
+                'best_fitness': int(population.fitness[order[0]]),
+                'avg_fitness': float(population.fitness.mean()),
+                'best_score': best_score,
+                'ticks': simulator.ticks,
+                'termination': simulator.termination
+            }))
+
+            # Same stopping rules as Trainer.train; solving stops every island
+            if solved_score is not None and best_score >= solved_score:
+                stop.set()
+                stop_reason = 'solved'
+                break
+            stalled = 0 if improved else stalled + 1
+            if plateau is not None and stalled >= plateau:
+                stop_reason = 'plateau'
+                break
+
+            if migrants and (generation + 1) % migration_interval == 0:
+                top = order[:migrants]
+                outbox.put((population.genomes[top].copy(), population.fitness[top].copy()))
+
+                # Immigrants replace the weakest birds before selection
+                incoming = _receive(inbox)
+                if incoming is not None:
+                    genomes, fitness = incoming
+                    worst = order[len(order) - len(genomes):]
+                    population.genomes[worst] = genomes
+                    population.fitness[worst] = fitness
+
+            simulator.reset(Population(ga.evolve(population.genomes, population.fitness,
+                                                 termination=simulator.termination)))
+
+        # Leftover migrants may never be read; do not block exit on them
+        outbox.cancel_join_thread()
+        results.put(('done', index, (best_genome, best_fitness, stop_reason)))
+    except Exception:
+        # Tell the parent instead of leaving it waiting for a 'done' that never comes
+        results.put(('error', index, traceback.format_exc()))
+        raise
+
+
+class IslandModel:
+    """
+    Runs several independent GeneticAlgorithm populations in separate
+    processes. Every migration_interval generations each island sends its
+    best genomes to the next island in a ring and takes in whatever its
+    neighbour has sent, without waiting for it. An island stops early
+    when its best fitness plateaus, and all of them stop once any island
+    reaches the solved score.
+    """
+
+    def __init__(self, islands=4, migration_interval=10, migrants=2, seed=None, decision_interval=1,
+                 selection=SELECTION, jit=False):
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrants = migrants
+        self.rng = random.Random(seed)
+        self.decision_interval = decision_interval
+        self.selection = selection
+        self.jit = jit
+        self.stop_reason = None
+
+    def run(self, generations, max_ticks=None, max_pipes=None, plateau=None, solved_score=None, callback=None):
+        """
+        Evolve every island for up to the given number of generations, with
+        the budgets and stopping rules of Trainer.train. callback receives
+        (island_index, stats) as generations complete. Returns the best
+        genome seen on any island and its fitness; self.stop_reason is
+        'solved', 'plateau' (every island stalled) or 'generations'.
+        """
+        channels = [multiprocessing.Queue() for _ in range(self.islands)]
+        results = multiprocessing.Queue()
+        stop = multiprocessing.Event()
+
+        processes = []
+        for index in range(self.islands):
+            process = multiprocessing.Process(
+                target=_run_island,
+                args=(index, self.rng.randrange(2 ** 32), generations,
+                      self.migration_interval, self.migrants,
+                      channels[index], channels[(index + 1) % self.islands],
+                      results, stop, max_ticks, max_pipes, plateau, solved_score,
+                      self.decision_interval, self.selection, self.jit),
+                daemon=True
+            )
+            process.start()
+            processes.append(process)
+
+        best_genome, best_fitness = None, None
+        reasons = []
+        finished = set()
+        while len(finished) < self.islands:
+            try:
+                kind, index, payload = results.get(timeout=1)
+            except queue.Empty:
+                # An island killed outright (e.g. out of memory) never reports back
+                for index, process in enumerate(processes):
+                    if index not in finished and process.exitcode not in (None, 0):
+                        self._stop(processes)
+                        raise RuntimeError(f"Island {index} died with exit code {process.exitcode}")
+                continue
+            if kind == 'error':
+                self._stop(processes)
+                raise RuntimeError(f"Island {index} failed:\n{payload}")
+            if kind == 'generation':
+                if callback is not None:
+                    callback(index, payload)
+            else:
+                finished.add(index)
+                genome, fitness, reason = payload
+                reasons.append(reason)
+                if genome is not None and (best_fitness is None or fitness > best_fitness):
+                    best_genome, best_fitness = genome, fitness
+
+        for process in processes:
+            process.join()
+        if 'solved' in reasons:
+            self.stop_reason = 'solved'
+        elif all(reason == 'plateau' for reason in reasons):
+            self.stop_reason = 'plateau'
+        else:
+            self.stop_reason = 'generations'
+        return best_genome, best_fitness
+
+    @staticmethod
+    def _stop(processes):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
@@ -0,0 +1,250 @@
+# ===========================================
+# JIT SIMULATOR - Compiled Episode Kernel
+# ===========================================
+
+import numpy as np
+from config import *
+from population import GROUND_Y
+from simulator import Simulator
+from sensors import SENSOR_NAMES
+from neural_network import sigmoid_limit
+
+try:
+    from numba import njit
+    JIT_AVAILABLE = True
+except ImportError:
+    JIT_AVAILABLE = False
+
+# Pipe gaps handed to the kernel per call; it comes back for more when they run out
+GAP_CHUNK = 32
+
+# Genome dtypes the kernel computes in; numba has no float16, so those
+# populations fly the NumPy loop
+KERNEL_DTYPES = (np.dtype(np.float32), np.dtype(np.float64))
+
+# The kernel refers to the activations of neural_network.py by their position
+# here, and to sensors by their position in SENSOR_NAMES
+LINEAR, RELU, SIGMOID, TANH = range(4)
+KERNEL_ACTIVATIONS = ['linear', 'relu', 'sigmoid', 'tanh']
+SENSOR_Y, SENSOR_VELOCITY = SENSOR_NAMES.index('y'), SENSOR_NAMES.index('velocity')
+PIPE_SENSORS = SENSOR_NAMES.index('gap_top')   # the rest come in frame order
+FRAME_SIZE = len(SENSOR_NAMES) - PIPE_SENSORS
+
+
+def _episode(x, y, velocity, alive, fitness, score,
+             sensors, weights, biases, activations, limit,
+             pipe_x, gap_top, gap_bottom, passed, pipe_count, spawn_timer,
+             gaps, max_ticks, max_pipes):
+    """
+    Simulator.step in one loop: think, physics, pipes, collisions and
+    scoring, bird by bird and tick by tick, with the same arithmetic in
+    the same order as the NumPy path. Runs until every bird is dead, a
+    budget (-1 for none) runs out, or a pipe is due for which there is
+    no gap left in gaps. sensors holds the SENSOR_NAMES codes of the
+    inputs, weights and biases every layer of the BatchedNetwork and
+    activations their KERNEL_ACTIVATIONS codes; limit is where sigmoid
+    clips. Bird and pipe arrays are updated in place; returns (ticks,
+    pipes spawned, pipe count, spawn timer).
+    """
+    size = len(alive)
+    # Row l holds the outputs of layer l (row 0 the inputs), in the genomes'
+    # dtype: storing a result rounds it like NumPy's out= buffers do
+    width = weights[0].shape[1]
+    for l in range(len(weights)):
+        width = max(width, weights[l].shape[2])
+    values = np.zeros((len(weights) + 1, width), dtype=weights[0].dtype)
+    # Pipe sensors of the tick, as SensorPipeline.pipe_frame
+    frame = np.zeros(FRAME_SIZE)
+    living = 0
+    best_score = 0
+    for i in range(size):
+        if alive[i]:
+            living += 1
+        if i == 0 or score[i] > best_score:
+            best_score = score[i]
+
+    ticks = 0
+    spawned = 0
+    while living > 0:
+        if max_ticks >= 0 and ticks >= max_ticks:
+            break
+        if max_pipes >= 0 and size > 0 and best_score >= max_pipes:
+            break
+        if spawn_timer + 1 >= PIPE_SPAWN_RATE and spawned == len(gaps):
+            break
+
+        # Birds think: every bird sees the same pipes ahead
+        next_pipe = -1
+        for p in range(pipe_count):
+            if pipe_x[p] + PIPE_WIDTH > BIRD_X:
+                next_pipe = p
+                break
+        if next_pipe >= 0:
+            for ahead in range(len(frame) // 3):
+                p = next_pipe + ahead
+                if p < pipe_count:
+                    frame[3 * ahead] = gap_top[p] / SCREEN_HEIGHT
+                    frame[3 * ahead + 1] = gap_bottom[p] / SCREEN_HEIGHT
+                    frame[3 * ahead + 2] = (pipe_x[p] - BIRD_X) / SCREEN_WIDTH
+                else:
+                    frame[3 * ahead] = 0.0
+                    frame[3 * ahead + 1] = 1.0
+                    frame[3 * ahead + 2] = 1.0
+            for i in range(size):
+                if not alive[i]:
+                    continue
+                for column in range(len(sensors)):
+                    if sensors[column] == SENSOR_Y:
+                        values[0, column] = y[i] / SCREEN_HEIGHT
+                    elif sensors[column] == SENSOR_VELOCITY:
+                        values[0, column] = velocity[i] + 10
+                        values[0, column] = values[0, column] / 20
+                    else:
+                        values[0, column] = frame[sensors[column] - PIPE_SENSORS]
+                for l in range(len(weights)):
+                    layer_weights = weights[l]
+                    layer_bias = biases[l]
+                    activation = activations[l]
+                    for j in range(layer_weights.shape[2]):
+                        # Starting from the first product (not 0.0) keeps the sum in the genomes' dtype
+                        total = values[l, 0] * layer_weights[i, 0, j]
+                        for k in range(1, layer_weights.shape[1]):
+                            total += values[l, k] * layer_weights[i, k, j]
+                        values[l + 1, j] = total + layer_bias[i, j]
+                        # Same results as the NumPy activations, NaN included
+                        if activation == RELU:
+                            if values[l + 1, j] <= 0:
+                                values[l + 1, j] = 0
+                        elif activation == SIGMOID:
+                            values[l + 1, j] = -min(max(values[l + 1, j], -limit), limit)
+                            values[l + 1, j] = np.exp(values[l + 1, j])
+                            values[l + 1, j] = 1 + values[l + 1, j]
+                            values[l + 1, j] = 1 / values[l + 1, j]
+                        elif activation == TANH:
+                            values[l + 1, j] = np.tanh(values[l + 1, j])
+                if values[len(weights), 0] > 0.5:
+                    velocity[i] = FLAP_STRENGTH
+
+        # Physics (update_physics)
+        for i in range(size):
+            if not alive[i]:
+                continue
+            velocity[i] += GRAVITY
+            y[i] += velocity[i]
+            fitness[i] += 1
+            if y[i] - BIRD_RADIUS <= 0:
+                y[i] = BIRD_RADIUS
+                velocity[i] = 0
+            if y[i] + BIRD_RADIUS >= GROUND_Y:
+                y[i] = GROUND_Y - BIRD_RADIUS
+                alive[i] = False
+                living -= 1
+
+        # Pipes move, leave the screen and spawn (PipeManager.advance)
+        kept = 0
+        for p in range(pipe_count):
+            pipe_x[p] -= PIPE_SPEED
+            if pipe_x[p] + PIPE_WIDTH >= 0:
+                pipe_x[kept] = pipe_x[p]
+                gap_top[kept] = gap_top[p]
+                gap_bottom[kept] = gap_bottom[p]
+                passed[kept] = passed[p]
+                kept += 1
+        pipe_count = kept
+        spawn_timer += 1
+        if spawn_timer >= PIPE_SPAWN_RATE:
+            pipe_x[pipe_count] = SCREEN_WIDTH
+            gap_top[pipe_count] = gaps[spawned]
+            gap_bottom[pipe_count] = gaps[spawned] + PIPE_GAP
+            passed[pipe_count] = False
+            pipe_count += 1
+            spawned += 1
+            spawn_timer = 0
+
+        # Collisions (PipeManager.collision_mask)
+        for i in range(size):
+            if not alive[i]:
+                continue
+            for p in range(pipe_count):
+                if (x[i] + BIRD_RADIUS > pipe_x[p] and x[i] - BIRD_RADIUS < pipe_x[p] + PIPE_WIDTH
+                        and (y[i] - BIRD_RADIUS < gap_top[p] or y[i] + BIRD_RADIUS > gap_bottom[p])):
+                    alive[i] = False
+                    living -= 1
+                    break
+
+        # Pipes cleared by the front-most living bird (PipeManager.mark_passed)
+        if living > 0:
+            front = -np.inf
+            for i in range(size):
+                if alive[i] and x[i] > front:
+                    front = x[i]
+            cleared = 0
+            for p in range(pipe_count):
+                if not passed[p] and front > pipe_x[p] + PIPE_WIDTH:
+                    passed[p] = True
+                    cleared += 1
+            if cleared:
+                for i in range(size):
+                    if alive[i]:
+                        score[i] += cleared
+                        fitness[i] += 100 * cleared
+                        if score[i] > best_score:
+                            best_score = score[i]
+
+        ticks += 1
+
+    return ticks, spawned, pipe_count, spawn_timer
+
+
+if JIT_AVAILABLE:
+    _episode = njit(cache=True)(_episode)
+
+
+class JitSimulator(Simulator):
+    """
+    Simulator whose run() flies the whole generation in one compiled
+    loop (see _episode) instead of a few dozen array calls per tick.
+    Fitness, score and pipes come out bit-identical to Simulator.run
+    under the same seed. step() is still the NumPy one, so the viewer
+    can drive it tick by tick. Needs numba (see create_simulator).
+    Float16 genomes are not compiled and run through Simulator.run.
+    """
+
+    def run(self, max_ticks=None, max_pipes=None):
+        population = self.population
+        if population.genomes.dtype not in KERNEL_DTYPES:
+            return super().run(max_ticks, max_pipes)
+        pipes = self.pipe_manager
+        sensors = np.array([SENSOR_NAMES.index(name) for name in population.sensors.names], dtype=np.int64)
+        layers = population.network.layers
+        weights = tuple(layer[0] for layer in layers)
+        biases = tuple(layer[1] for layer in layers)
+        activations = np.array([KERNEL_ACTIVATIONS.index(layer[2]) for layer in layers], dtype=np.int64)
+
+        while True:
+            self.termination = self.check_budget(max_ticks, max_pipes)
+            if self.termination is not None:
+                return self.ticks
+
+            # Pipe buffers with room for every pipe the kernel may spawn
+            gaps = pipes.upcoming_gap_tops(GAP_CHUNK)
+            count = len(pipes.x)
+            buffers = []
+            for values, dtype in ((pipes.x, np.int64), (pipes.gap_top, np.int64),
+                                  (pipes.gap_bottom, np.int64), (pipes.passed, bool)):
+                buffer = np.empty(count + len(gaps), dtype=dtype)
+                buffer[:count] = values
+                buffers.append(buffer)
+
+            with self.timer.phase('physics'):
+                ticks, spawned, count, pipes.spawn_timer = _episode(
+                    population.x, population.y, population.velocity, population.alive,
+                    population.fitness, population.score,
+                    sensors, weights, biases, activations, sigmoid_limit(population.genomes.dtype),
+                    *buffers, count, pipes.spawn_timer, gaps,
+                    -1 if max_ticks is None else max_ticks - self.ticks,
+                    -1 if max_pipes is None else max_pipes)
+
+            pipes.x, pipes.gap_top, pipes.gap_bottom, pipes.passed = (buffer[:count].copy() for buffer in buffers)
+            pipes.skip_spawns(spawned)
+            self.ticks += ticks
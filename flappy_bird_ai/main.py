@@ -3,20 +3,30 @@
 # ===========================================
 
 import pygame
-import os
+import time
+import argparse
 from config import *
 from bird import Bird
-from pipe import PipeManager
 from genetic_algorithm import GeneticAlgorithm
-from neural_network import NeuralNetwork
+from population import Population
+from simulator import Simulator
+from profiler import PhaseTimer
+from sprites import Label, panel, draw_birds
+from stats_publisher import StatsPublisher
+from brain_store import BrainStore
+from checkpoint import save_checkpoint, load_checkpoint
 
-# Initialize Pygame
-pygame.init()
-screen = pygame.display. set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Flappy Bird AI - Genetic Algorithm")
-clock = pygame.time. Clock()
+CHECKPOINT_FILE = "checkpoint.npz"
+BRAIN_FILE = "best_brain.json"
+PROFILE_FILE = "profile.csv"
 
-def main():
+def main(resume=None, stats=None, plot=None, live_plot=False):
+    # Initialize Pygame
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Flappy Bird AI - Genetic Algorithm")
+    clock = pygame.time.Clock()
+    
     running = True
     
     # Initialize Genetic Algorithm
@@ -24,11 +34,34 @@ def main():
     
     # Create initial population
     print(f"Creating {POPULATION_SIZE} birds...")
-    birds = ga.create_initial_population(Bird)
-    print(f"Created {len(birds)} birds!")
+    population = Population(ga.create_initial_genomes())
+    print(f"Created {len(population)} birds!")
+    
+    # Continue a saved run
+    if resume:
+        state = load_checkpoint(resume, seeded=False)
+        ga = state['ga']
+        population = Population(state['genomes'])
+        print(f"Resumed from {resume} at generation {ga.generation}")
+    
+    # Statistics file and matplotlib plot, written by a background process
+    publisher = None
+    if stats or plot or live_plot:
+        publisher = StatsPublisher(stats, plot, live=live_plot)
+    
+    # Brain and checkpoint files are read and written in the background
+    store = BrainStore()
+    pending_brain = None    # brain being loaded for demo mode
+    demo_brain = None       # brain demo mode restarts with
     
-    # Create pipe manager
-    pipe_manager = PipeManager()
+    # Kept as a running max instead of scanning the history every frame
+    best_ever = max(ga.best_fitness_history, default=None)
+    
+    # Per-phase timing, off until P is pressed
+    timer = PhaseTimer()
+    
+    # Headless engine does the simulation, this loop only renders it
+    simulator = Simulator(population, timer=timer)
     
     # Initialize fitness graph
     graph = None
@@ -36,6 +69,7 @@ def main():
     try:
         from fitness_graph import FitnessGraph
         graph = FitnessGraph()
+        graph.update(ga.best_fitness_history, ga.avg_fitness_history)
         print("Fitness graph initialized!")
     except Exception as e:
         print(f"Could not create graph: {e}")
@@ -46,104 +80,189 @@ def main():
     font = pygame.font.Font(None, 36)
     small_font = pygame.font.Font(None, 28)
     
-    # Speed control
+    # HUD text, re-rendered only when its value changes
+    title_label = Label(font)
+    alive_label = Label(small_font)
+    score_label = Label(small_font)
+    fitness_label = Label(small_font)
+    speed_label = Label(small_font)
+    best_label = Label(small_font, YELLOW)
+    
+    # The controls panel never changes, render its text once
+    controls = [
+        ("S", "Speed"),
+        ("V", "Best Only"),
+        ("R", "Reset"),
+        ("B", "Save Brain"),
+        ("L", "Load Brain"),
+        ("C", "Checkpoint"),
+        ("G", "Graph"),
+        ("P", "Profile")
+    ]
+    controls_text = [(small_font.render("⌨ Controls", True, YELLOW), (SCREEN_WIDTH - 160, 15))]
+    for i, (key, action) in enumerate(controls):
+        controls_text.append((small_font.render(f"{key}: {action}", True, WHITE), (SCREEN_WIDTH - 160, 40 + i * 20)))
+    
+    # Speed control (None = as many ticks as fit in a frame at RENDER_FPS)
     game_speed = 1
-    speed_options = [1, 2, 5, 10]
+    speed_options = [1, 2, 5, 10, None]
     speed_index = 0
     
+    # Draw every bird, or only the best few
+    draw_all = True
+    
     # Demo mode
     demo_mode = False
     
+    # Fixed simulation timestep: game_speed ticks per 1/FPS seconds of real
+    # time, whatever the render rate
+    pending_ticks = 0.0
+    last_time = time.perf_counter()
+    
     while running:
+        frame_start = time.perf_counter()
+        pending_ticks += min(frame_start - last_time, MAX_FRAME_TIME) * FPS * (game_speed or 0)
+        last_time = frame_start
+        finished_generation = None
+        
         # Event handling
-        for event in pygame. event.get():
-            if event.type == pygame.QUIT: 
-                running = False
-            
-            if event.type == pygame. KEYDOWN:
-                # Speed control
-                if event.key == pygame.K_s:
-                    speed_index = (speed_index + 1) % len(speed_options)
-                    game_speed = speed_options[speed_index]
-                    print(f"Speed:  {game_speed}x")
+        with timer.phase('events'):
+            for event in pygame. event.get():
+                if event.type == pygame.QUIT: 
+                    running = False
                 
-                # Reset
-                if event.key == pygame. K_r:
-                    ga = GeneticAlgorithm()
-                    birds = ga. create_initial_population(Bird)
-                    pipe_manager.reset()
-                    demo_mode = False
-                    print("Reset!")
-                
-                # Save best brain
-                if event.key == pygame.K_b:
-                    best_bird = max(birds, key=lambda b:  b.fitness)
-                    best_bird.brain.save("best_brain.json")
-                
-                # Load best brain (demo mode)
-                if event.key == pygame.K_l:
-                    if os.path.exists("best_brain.json"):
-                        loaded_brain = NeuralNetwork. load("best_brain.json")
-                        birds = [Bird(neural_network=loaded_brain)]
-                        pipe_manager.reset()
-                        demo_mode = True
-                        print("Demo mode: Watching saved brain!")
-                    else:
-                        print("No saved brain found!  Press B to save one first.")
-                
-                # Toggle graph
-                if event.key == pygame. K_g:
-                    if graph and show_graph:
-                        graph.close()
-                        graph = None
-                        show_graph = False
-                        print("Graph closed")
-                    else:
-                        try:
-                            from fitness_graph import FitnessGraph
-                            graph = FitnessGraph()
-                            show_graph = True
-                            # Update with existing data
-                            if ga.best_fitness_history:
-                                graph.update(ga. best_fitness_history, ga. avg_fitness_history)
-                            print("Graph opened")
-                        except Exception as e:
-                            print(f"Could not create graph: {e}")
+                if event.type == pygame. KEYDOWN:
+                    # Speed control
+                    if event.key == pygame.K_s:
+                        speed_index = (speed_index + 1) % len(speed_options)
+                        game_speed = speed_options[speed_index]
+                        print(f"Speed:  {game_speed}x" if game_speed else "Speed:  Max")
+                    
+                    # Draw all birds / only the best
+                    if event.key == pygame.K_v:
+                        draw_all = not draw_all
+                        print("Drawing all birds" if draw_all else f"Drawing the best {DRAWN_BIRDS} birds")
+                    
+                    # Reset
+                    if event.key == pygame. K_r:
+                        ga = GeneticAlgorithm()
+                        simulator.reset(Population(ga.create_initial_genomes()))
+                        demo_mode = False
+                        pending_brain = None
+                        best_ever = None
+                        if graph:
+                            graph.clear()
+                        print("Reset!")
+                    
+                    # Save best brain
+                    if event.key == pygame.K_b:
+                        store.save(simulator.best_bird().brain, BRAIN_FILE)
+                    
+                    # Save checkpoint of the whole run
+                    if event.key == pygame.K_c:
+                        if demo_mode:
+                            print("Nothing to checkpoint in demo mode!")
+                        else:
+                            store.save_checkpoint(CHECKPOINT_FILE, ga, simulator.population.genomes)
+                            print(f"Saving checkpoint to {CHECKPOINT_FILE}...")
+                    
+                    # Load best brain (demo mode starts once it is read)
+                    if event.key == pygame.K_l:
+                        pending_brain = store.load(BRAIN_FILE)
+                    
+                    # Toggle graph
+                    if event.key == pygame. K_g:
+                        if graph and show_graph:
+                            graph.close()
+                            graph = None
+                            show_graph = False
+                            print("Graph closed")
+                        else:
+                            try:
+                                from fitness_graph import FitnessGraph
+                                graph = FitnessGraph()
+                                show_graph = True
+                                # Update with existing data
+                                if ga.best_fitness_history:
+                                    graph.update(ga. best_fitness_history, ga. avg_fitness_history)
+                                print("Graph opened")
+                            except Exception as e:
+                                print(f"Could not create graph: {e}")
+                    
+                    # Toggle profiler
+                    if event.key == pygame.K_p:
+                        if timer.toggle(PROFILE_FILE):
+                            print(f"Profiling to {PROFILE_FILE}")
+                        else:
+                            print("Profiling stopped")
+        
+        # Start demo mode when the loaded brain arrives
+        if pending_brain is not None and pending_brain.done():
+            try:
+                demo_brain = pending_brain.result()
+                simulator.reset([Bird(neural_network=demo_brain)])
+                demo_mode = True
+                print("Demo mode: Watching saved brain!")
+            except FileNotFoundError:
+                print("No saved brain found!  Press B to save one first.")
+            except ValueError as error:
+                # A brain for another topology, or a corrupt file (json.JSONDecodeError is a ValueError)
+                print(f"Could not load the saved brain: {error}")
+            pending_brain = None
         
         # ============ GAME LOGIC ============
-        for _ in range(game_speed):
-            # Birds think
-            for bird in birds:
-                bird.think(pipe_manager.pipes)
-            
-            # Update birds
-            for bird in birds:
-                bird.update()
+        deadline = frame_start + 1 / RENDER_FPS
+        budget = int(pending_ticks)
+        pending_ticks -= budget
+        ticks = 0
+        while (ticks < budget) if game_speed else (time.perf_counter() < deadline):
+            ticks += 1
             
-            # Update pipes
-            pipe_manager. update()
+            # Think, move, collide and score in one tick
+            alive_count = simulator.step()
             
-            # Check collisions
-            pipe_manager. check_collisions(birds)
-            pipe_manager.check_passed(birds)
+            # Generation ends when all dead (or its evaluation budget runs out)
+            if demo_mode:
+                termination = 'extinct' if alive_count == 0 else None
+            else:
+                termination = simulator.check_budget(MAX_TICKS_PER_GENERATION, MAX_PIPES_PER_GENERATION)
             
-            # Count alive
-            alive_count = sum(1 for bird in birds if bird.alive)
-            
-            # Evolution when all dead
-            if alive_count == 0:
+            if termination is not None:
                 if demo_mode:
-                    # Restart demo with same brain
-                    loaded_brain = NeuralNetwork. load("best_brain.json")
-                    birds = [Bird(neural_network=loaded_brain)]
-                    pipe_manager.reset()
+                    # Restart demo with the same (cached) brain
+                    simulator.reset([Bird(neural_network=demo_brain)])
                 else:
-                    # Normal evolution
-                    best_fitness = max(b.fitness for b in birds)
-                    print(f"Generation {ga.generation} complete!  Best fitness: {best_fitness}")
+                    best_bird = simulator.best_bird()
+                    print(f"Generation {ga.generation} complete!  Best fitness: {best_bird.fitness}")
+                    if termination != 'extinct':
+                        print(f"Generation capped: {termination}")
+                    
+                    if publisher:
+                        publisher.publish({
+                            'generation': ga.generation,
+                            'best_fitness': int(best_bird.fitness),
+                            'avg_fitness': float(simulator.population.fitness.mean()),
+                            'best_score': int(best_bird.score),
+                            'ticks': simulator.ticks,
+                            'termination': termination
+                        })
                     
-                    birds = ga.create_next_generation(birds, Bird)
-                    pipe_manager.reset()
+                    if SOLVED_SCORE is not None and best_bird.score >= SOLVED_SCORE:
+                        # Solved: save the champion and watch it
+                        store.save(best_bird.brain, BRAIN_FILE)
+                        demo_brain = best_bird.brain.copy()
+                        simulator.reset([Bird(neural_network=demo_brain)])
+                        demo_mode = True
+                        print("Solved! Demo mode: Watching the champion!")
+                    else:
+                        # Normal evolution
+                        finished_generation = ga.generation
+                        with timer.phase('evolution'):
+                            population = simulator.population
+                            simulator.reset(Population(ga.evolve(population.genomes, population.fitness,
+                                                                 termination=termination)))
+                        if best_ever is None or ga.best_fitness_history[-1] > best_ever:
+                            best_ever = ga.best_fitness_history[-1]
                     
                     # Update graph
                     if graph and show_graph:
@@ -154,87 +273,88 @@ def main():
                 break
         
         # Get stats
-        best_bird = max(birds, key=lambda b: b. fitness)
-        alive_count = sum(1 for bird in birds if bird.alive)
+        birds = simulator.birds
+        best_index = simulator.population.best_index()
+        drawn = simulator.population.top_alive(None if draw_all else DRAWN_BIRDS)
+        drawn = drawn[drawn != best_index]
+        best_bird = birds[best_index]
+        alive_count = simulator.alive_count
         
         # ============ DRAWING ============
-        screen.fill(SKY_BLUE)
-        
-        # Draw pipes
-        pipe_manager.draw(screen)
-        
-        # Draw ground
-        pygame.draw.rect(screen, GREEN, (0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, 50))
-        pygame.draw.rect(screen, (20, 100, 20), (0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, 5))
-        
-        # Draw ALL birds
-        for bird in birds:
-            if bird != best_bird:
-                bird.draw(screen, is_best=False)
-        best_bird.draw(screen, is_best=True)
-        
-        # ============ UI - LEFT PANEL ============
-        panel = pygame.Surface((200, 175))
-        panel.set_alpha(200)
-        panel.fill((30, 30, 30))
-        screen.blit(panel, (10, 10))
-        pygame.draw.rect(screen, WHITE, (10, 10, 200, 175), 2)
-        
-        # Title
-        if demo_mode:
-            title = font.render("🎬 DEMO", True, YELLOW)
-        else:
-            title = font. render(f"🧬 Gen:  {ga.generation}", True, WHITE)
-        screen.blit(title, (20, 15))
-        
-        alive_text = small_font.render(f"Alive: {alive_count}/{len(birds)}", True, WHITE)
-        screen.blit(alive_text, (20, 50))
-        
-        score_text = small_font.render(f"Score: {best_bird.score}", True, WHITE)
-        screen.blit(score_text, (20, 75))
-        
-        fitness_text = small_font.render(f"Fitness: {best_bird.fitness}", True, WHITE)
-        screen.blit(fitness_text, (20, 100))
-        
-        speed_text = small_font.render(f"Speed: {game_speed}x", True, WHITE)
-        screen.blit(speed_text, (20, 125))
-        
-        # Best ever
-        if ga.best_fitness_history and not demo_mode:
-            best_ever = max(ga.best_fitness_history)
-            best_text = small_font.render(f"Best Ever: {best_ever}", True, YELLOW)
-            screen.blit(best_text, (20, 150))
-        
-        # ============ UI - RIGHT PANEL (Controls) ============
-        controls_panel = pygame.Surface((160, 140))
-        controls_panel.set_alpha(200)
-        controls_panel.fill((30, 30, 30))
-        screen.blit(controls_panel, (SCREEN_WIDTH - 170, 10))
-        pygame.draw.rect(screen, WHITE, (SCREEN_WIDTH - 170, 10, 160, 140), 2)
-        
-        ctrl_title = small_font.render("⌨ Controls", True, YELLOW)
-        screen.blit(ctrl_title, (SCREEN_WIDTH - 160, 15))
-        
-        controls = [
-            ("S", "Speed"),
-            ("R", "Reset"),
-            ("B", "Save Brain"),
-            ("L", "Load Brain"),
-            ("G", "Graph")
-        ]
-        
-        for i, (key, action) in enumerate(controls):
-            ctrl_text = small_font.render(f"{key}: {action}", True, WHITE)
-            screen.blit(ctrl_text, (SCREEN_WIDTH - 160, 40 + i * 20))
+        with timer.phase('render'):
+            screen.fill(SKY_BLUE)
+            
+            # Draw pipes
+            simulator.pipe_manager.draw(screen)
+            
+            # Draw ground
+            pygame.draw.rect(screen, GREEN, (0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, 50))
+            pygame.draw.rect(screen, (20, 100, 20), (0, SCREEN_HEIGHT - 50, SCREEN_WIDTH, 5))
+            
+            # Draw the alive birds (or the best few), best on top
+            population = simulator.population
+            draw_birds(screen, population.x[drawn].tolist(), population.y[drawn].tolist())
+            best_bird.draw(screen, is_best=True)
+            
+            # ============ UI - LEFT PANEL ============
+            screen.blit(panel(200, 175), (10, 10))
+            pygame.draw.rect(screen, WHITE, (10, 10, 200, 175), 2)
+            
+            # Title
+            if demo_mode:
+                title = title_label.render("🎬 DEMO", YELLOW)
+            else:
+                title = title_label.render(f"🧬 Gen:  {ga.generation}")
+            screen.blit(title, (20, 15))
+            
+            screen.blit(alive_label.render(f"Alive: {alive_count}/{len(birds)}"), (20, 50))
+            screen.blit(score_label.render(f"Score: {best_bird.score}"), (20, 75))
+            screen.blit(fitness_label.render(f"Fitness: {best_bird.fitness}"), (20, 100))
+            screen.blit(speed_label.render(f"Speed: {game_speed}x" if game_speed else "Speed: Max"), (20, 125))
+            
+            # Best ever
+            if best_ever is not None and not demo_mode:
+                screen.blit(best_label.render(f"Best Ever: {best_ever}"), (20, 150))
+            
+            # ============ UI - RIGHT PANEL (Controls) ============
+            screen.blit(panel(160, 200), (SCREEN_WIDTH - 170, 10))
+            pygame.draw.rect(screen, WHITE, (SCREEN_WIDTH - 170, 10, 160, 200), 2)
+            screen.blits(controls_text, doreturn=False)
+            
+            # ============ FITNESS GRAPH ============
+            if graph and show_graph and not demo_mode:
+                graph.draw(screen)
+            
+            # Profiler overlay (only while profiling)
+            timer.draw(screen, small_font, 10, 195)
         
         # Update display
-        pygame.display. flip()
-        clock.tick(FPS)
+        with timer.phase('flip'):
+            pygame.display. flip()
+        timer.end_frame()
+        if finished_generation is not None:
+            timer.end_generation(finished_generation)
+        # Unlimited speed is paced by its simulation budget instead
+        clock.tick(FPS if game_speed else 0)
     
     # Cleanup
+    timer.close()
     if graph:
         graph.close()
+    if publisher:
+        publisher.close()
+    store.close()
+    # Closing the window keeps the run
+    if not demo_mode:
+        save_checkpoint(CHECKPOINT_FILE, ga, simulator.population.genomes)
+        print(f"Checkpoint saved to {CHECKPOINT_FILE}! Resume with --resume {CHECKPOINT_FILE}")
     pygame.quit()
 
 if __name__ == "__main__": 
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Flappy Bird AI - Genetic Algorithm")
+    parser.add_argument("--resume", default=None, help="continue from a checkpoint file")
+    parser.add_argument("--stats", default=None, help="write per-generation statistics to this CSV file")
+    parser.add_argument("--plot", default=None, help="save a matplotlib fitness plot to this image file")
+    parser.add_argument("--live-plot", action="store_true", help="show the matplotlib fitness plot in its own window")
+    args = parser.parse_args()
+    main(args.resume, args.stats, args.plot, args.live_plot)
\ No newline at end of file
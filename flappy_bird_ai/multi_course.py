@@ -0,0 +1,164 @@
+# ===========================================
+# MULTI-COURSE EVALUATION - Fitness over Several Courses
+# ===========================================
+
+import numpy as np
+from config import *
+from pipe import PipeManager
+from population import update_physics
+from neural_network import BatchedNetwork
+from sensors import SensorPipeline
+
+AGGREGATES = ('mean', 'min', 'quantile')
+
+# Pipe gaps drawn from each course's random stream at a time
+GAP_CHUNK = 32
+
+
+def aggregate(values, how='mean', quantile=0.25):
+    """Combine (courses, population) results into one value per genome."""
+    if how == 'mean':
+        return values.mean(axis=0)
+    if how == 'min':
+        return values.min(axis=0)
+    if how == 'quantile':
+        return np.quantile(values, quantile, axis=0)
+    raise ValueError(f"Unknown aggregate {how!r}, choose from {', '.join(AGGREGATES)}")
+
+
+class CourseBatch:
+    """
+    The same genomes flown over several seeded courses at once, with the
+    bird state held as (courses, population) arrays. Every course spawns
+    its pipes at the same ticks and x positions and only the gaps differ,
+    so the pipes are one set of x positions, passed flags and spawn timer
+    with (courses, pipes) gap arrays, and each tick is one batched think,
+    physics, collision and scoring pass over all courses. Fitness and
+    score on course e are exactly those of a Simulator run with seeds[e].
+    """
+
+    def __init__(self, genomes, seeds):
+        shape = (len(seeds), len(genomes))
+        self.genomes = genomes
+        self.network = BatchedNetwork(genomes)
+        self.plan = self.network.plan(shape)
+        self.y = np.full(shape, SCREEN_HEIGHT // 2, dtype=np.float64)
+        self.velocity = np.zeros(shape, dtype=np.float64)
+        self.alive = np.ones(shape, dtype=bool)
+        self.fitness = np.zeros(shape, dtype=np.int64)
+        self.score = np.zeros(shape, dtype=np.int64)
+        self.inputs = self.plan.inputs
+        self.sensors = SensorPipeline()
+
+        # Pipes as PipeManager keeps them, with one row of gaps per course
+        self.pipe_x = np.empty(0, dtype=np.int64)
+        self.gap_top = np.empty((len(seeds), 0), dtype=np.int64)
+        self.gap_bottom = np.empty((len(seeds), 0), dtype=np.int64)
+        self.passed = np.empty(0, dtype=bool)
+        # Each course's seeded gap stream, drawn GAP_CHUNK pipes at a time
+        self._gap_sources = [PipeManager(seed) for seed in seeds]
+        self.spawn_timer = self._gap_sources[0].spawn_timer
+        self._gaps = np.empty((len(seeds), 0), dtype=np.int64)
+
+        # Why each course ended (None while it is still running)
+        self.finished = np.full(len(seeds), None, dtype=object)
+        self.running = np.ones(len(seeds), dtype=bool)
+        self.ticks = 0
+
+    def _next_gap_tops(self):
+        if self._gaps.shape[1] == 0:
+            self._gaps = np.stack([source.upcoming_gap_tops(GAP_CHUNK) for source in self._gap_sources])
+            for source in self._gap_sources:
+                source.skip_spawns(GAP_CHUNK)
+        gap_tops, self._gaps = self._gaps[:, 0], self._gaps[:, 1:]
+        return gap_tops
+
+    def think(self):
+        frame = self.sensors.pipe_frame(self.pipe_x, self.gap_top, self.gap_bottom)
+        if frame is None:
+            return
+        self.sensors.fill(self.inputs, self.y, self.velocity, frame)
+
+        output = self.plan.run()
+        self.velocity[(output[..., 0] > 0.5) & self.alive] = FLAP_STRENGTH
+
+    def move_pipes(self):
+        # PipeManager.update for every course at once
+        self.pipe_x -= PIPE_SPEED
+        on_screen = self.pipe_x + PIPE_WIDTH >= 0
+        if not on_screen.all():
+            self.pipe_x = self.pipe_x[on_screen]
+            self.gap_top = self.gap_top[:, on_screen]
+            self.gap_bottom = self.gap_bottom[:, on_screen]
+            self.passed = self.passed[on_screen]
+
+        self.spawn_timer += 1
+        if self.spawn_timer >= PIPE_SPAWN_RATE:
+            gap_top = self._next_gap_tops()[:, None]
+            self.pipe_x = np.append(self.pipe_x, SCREEN_WIDTH)
+            self.gap_top = np.concatenate([self.gap_top, gap_top], axis=1)
+            self.gap_bottom = np.concatenate([self.gap_bottom, gap_top + PIPE_GAP], axis=1)
+            self.passed = np.append(self.passed, False)
+            self.spawn_timer = 0
+
+    def collide(self):
+        # Every bird flies at BIRD_X, so only pipes overlapping that column matter
+        x = self.pipe_x
+        overlapping = np.flatnonzero((BIRD_X + BIRD_RADIUS > x) & (BIRD_X - BIRD_RADIUS < x + PIPE_WIDTH))
+        if len(overlapping) == 0:
+            return
+        gap_top = self.gap_top[:, None, overlapping]
+        gap_bottom = self.gap_bottom[:, None, overlapping]
+        y = self.y[..., None]
+        outside_gap = ((y - BIRD_RADIUS < gap_top) | (y + BIRD_RADIUS > gap_bottom)).any(axis=-1)
+        self.alive &= ~outside_gap
+
+    def score_passes(self):
+        # PipeManager.mark_passed: the front-most living bird is at BIRD_X on every
+        # course that still has one, so a pipe is cleared at the same tick on all of
+        # them; courses without living birds score nothing either way
+        cleared = ~self.passed & (BIRD_X > self.pipe_x + PIPE_WIDTH)
+        if not cleared.any():
+            return
+        self.passed |= cleared
+        passed = int(np.count_nonzero(cleared))
+        self.score[self.alive] += passed
+        self.fitness[self.alive] += 100 * passed
+
+    def step(self):
+        self.think()
+        update_physics(self.y, self.velocity, self.alive, self.fitness)
+        self.move_pipes()
+        self.collide()
+        self.score_passes()
+        self.ticks += 1
+
+    def check_budget(self, max_ticks=None, max_pipes=None):
+        # Same order of checks as Simulator.check_budget, for every course at once
+        extinct = self.running & ~self.alive.any(axis=1)
+        self.finished[extinct] = 'extinct'
+        self.running &= ~extinct
+        if max_ticks is not None and self.ticks >= max_ticks:
+            self.finished[self.running] = 'max_ticks'
+            self.running[:] = False
+        if max_pipes is not None:
+            capped = self.running & (self.score.max(axis=1) >= max_pipes)
+            self.finished[capped] = 'max_pipes'
+            self.running &= ~capped
+            # Freeze those courses where their own runs would have stopped
+            self.alive[capped] = False
+
+    @property
+    def termination(self):
+        """'extinct' if every course died out, otherwise the budget that capped one."""
+        for reason in ('max_ticks', 'max_pipes'):
+            if reason in self.finished.tolist():
+                return reason
+        return 'extinct'
+
+    def run(self, max_ticks=None, max_pipes=None):
+        self.check_budget(max_ticks, max_pipes)
+        while self.running.any():
+            self.step()
+            self.check_budget(max_ticks, max_pipes)
+        return self.termination
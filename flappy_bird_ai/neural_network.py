@@ -4,45 +4,172 @@
 
 import numpy as np
 import json
-from config import INPUT_SIZE, HIDDEN_SIZE, OUTPUT_SIZE
+from config import INPUT_SIZE, OUTPUT_SIZE, HIDDEN_LAYERS, HIDDEN_ACTIVATION, OUTPUT_ACTIVATION, GENOME_DTYPE
+
+
+# Activations take an out= array like NumPy ufuncs (it may be x itself)
+def relu(x, out=None):
+    return np.maximum(0, x, out=out)
+
+
+def sigmoid_limit(dtype):
+    # Inputs are clipped where exp() would overflow in dtype (88 for float32,
+    # 11 for float16); sigmoid is 0 or 1 to within float precision there anyway
+    return min(500, int(np.log(np.finfo(dtype).max)))
+
+
+_SIGMOID_LIMITS = {np.dtype(t): sigmoid_limit(t) for t in (np.float16, np.float32, np.float64)}
+
+
+def sigmoid(x, out=None):
+    x = np.asarray(x)
+    limit = _SIGMOID_LIMITS.get(x.dtype, 500)
+    out = np.clip(x, -limit, limit, out=out)
+    np.negative(out, out=out)
+    np.exp(out, out=out)
+    np.add(1, out, out=out)
+    return np.divide(1, out, out=out)
+
+
+def tanh(x, out=None):
+    return np.tanh(x, out=out)
+
+
+def linear(x, out=None):
+    if out is None or out is x:
+        return x
+    out[...] = x
+    return out
+
+
+ACTIVATIONS = {
+    'relu': relu,
+    'sigmoid': sigmoid,
+    'tanh': tanh,
+    'linear': linear,
+}
+
+
+def _layers(hidden_sizes, hidden_activation, output_activation):
+    """
+    Parameter names, shapes and activations of a network with the given
+    hidden layers. Layers are called input, hidden (hidden1, hidden2, ...
+    when there are several) and output; layer b has weights_<a>_<b> from
+    the previous layer a and bias_<b>.
+    """
+    if isinstance(hidden_activation, str):
+        hidden_activation = [hidden_activation] * len(hidden_sizes)
+    if len(hidden_activation) != len(hidden_sizes):
+        raise ValueError("HIDDEN_ACTIVATION needs one activation per hidden layer")
+
+    names = ['input'] + (['hidden'] if len(hidden_sizes) == 1 else
+                         [f'hidden{i}' for i in range(1, len(hidden_sizes) + 1)]) + ['output']
+    sizes = [INPUT_SIZE] + list(hidden_sizes) + [OUTPUT_SIZE]
+    activations = list(hidden_activation) + [output_activation]
+
+    layout, layers = [], []
+    for i, activation in enumerate(activations):
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Unknown activation {activation!r}, choose from {', '.join(ACTIVATIONS)}")
+        weights, bias = f'weights_{names[i]}_{names[i + 1]}', f'bias_{names[i + 1]}'
+        layout += [(weights, (sizes[i], sizes[i + 1])), (bias, (sizes[i + 1],))]
+        layers.append((weights, bias, activation))
+    return layout, layers
+
+
+# Every genome is one flat float vector; the weight and bias matrices
+# below are reshaped views into it, stored in this order. LAYERS lists
+# (weights, bias, activation) from the input to the output layer.
+LAYOUT, LAYERS = _layers(HIDDEN_LAYERS, HIDDEN_ACTIVATION, OUTPUT_ACTIVATION)
+
+PARAM_SLICES = {}
+GENOME_SIZE = 0
+for _name, _shape in LAYOUT:
+    _size = int(np.prod(_shape))
+    PARAM_SLICES[_name] = (slice(GENOME_SIZE, GENOME_SIZE + _size), _shape)
+    GENOME_SIZE += _size
+
+
+def random_genomes(count, rng=np.random, dtype=GENOME_DTYPE):
+    # Drawn in float64 and rounded, so the random stream is the same for every dtype
+    return (rng.randn(count, GENOME_SIZE) * 0.5).astype(dtype)
+
+
+def _param(name):
+    def get(self):
+        return self._views[name]
+
+    def set(self, value):
+        self._views[name][...] = value
+
+    return property(get, set)
+
+
+class InferencePlan:
+    """
+    A forward pass worked out once for one batch shape: every layer
+    output has its own preallocated buffer, and run() only writes into
+    them (matmul, bias and activation all with out=), so deciding every
+    tick allocates nothing. Write the inputs into self.inputs, or pass
+    them to run(). The returned output buffer is overwritten by the next
+    run(). Inputs and outputs take the dtype of the weights, so a float32
+    genome is computed in float32 throughout.
+    """
+
+    def __init__(self, layers, batch_shape):
+        # layers: (weights, bias, activation name); weights are (in, out) or,
+        # for a population, (population, in, out)
+        self.dtype = layers[0][0].dtype
+        self.inputs = np.empty(tuple(batch_shape) + (layers[0][0].shape[-2],), dtype=self.dtype)
+        self.steps = []
+        for weights, bias, activation in layers:
+            out = np.empty(tuple(batch_shape) + (weights.shape[-1],), dtype=self.dtype)
+            self.steps.append((weights, bias, ACTIVATIONS[activation], out))
+
+    def run(self, inputs=None):
+        if inputs is not None:
+            self.inputs[...] = inputs
+        values = self.inputs
+        for weights, bias, activation, out in self.steps:
+            np.matmul(values[..., None, :], weights, out=out[..., None, :])
+            np.add(out, bias, out=out)
+            values = activation(out, out=out)
+        return values
+
 
 class NeuralNetwork:
-    def __init__(self):
-        self.weights_input_hidden = np.random. randn(INPUT_SIZE, HIDDEN_SIZE) * 0.5
-        self.bias_hidden = np.random.randn(HIDDEN_SIZE) * 0.5
-        self.weights_hidden_output = np.random.randn(HIDDEN_SIZE, OUTPUT_SIZE) * 0.5
-        self.bias_output = np.random.randn(OUTPUT_SIZE) * 0.5
+    
+    def __init__(self, params=None, rng=np.random):
+        # params may be a row of a population genome matrix (no copy is made)
+        if params is None:
+            params = random_genomes(1, rng)[0]
+        self.params = params
+        self._views = {
+            name: params[index].reshape(shape)
+            for name, (index, shape) in PARAM_SLICES.items()
+        }
+        self._plan = None
+    
+    @property
+    def layers(self):
+        return [(self._views[weights], self._views[bias], activation) for weights, bias, activation in LAYERS]
     
     def sigmoid(self, x):
-        x = np.clip(x, -500, 500)
-        return 1 / (1 + np.exp(-x))
+        return sigmoid(x)
     
     def relu(self, x):
-        return np.maximum(0, x)
+        return relu(x)
     
     def forward(self, inputs):
-        inputs = np.array(inputs)
-        hidden = np.dot(inputs, self.weights_input_hidden) + self.bias_hidden
-        hidden = self.relu(hidden)
-        output = np.dot(hidden, self.weights_hidden_output) + self.bias_output
-        output = self.sigmoid(output)
-        return output
+        if self._plan is None:
+            self._plan = InferencePlan(self.layers, ())
+        return self._plan.run(inputs).copy()
     
     def copy(self):
-        new_nn = NeuralNetwork()
-        new_nn.weights_input_hidden = self.weights_input_hidden.copy()
-        new_nn.bias_hidden = self. bias_hidden.copy()
-        new_nn.weights_hidden_output = self.weights_hidden_output.copy()
-        new_nn.bias_output = self. bias_output.copy()
-        return new_nn
+        return NeuralNetwork(self.params.copy())
     
     def save(self, filename):
-        data = {
-            'weights_input_hidden': self.weights_input_hidden.tolist(),
-            'bias_hidden': self.bias_hidden.tolist(),
-            'weights_hidden_output': self.weights_hidden_output.tolist(),
-            'bias_output': self.bias_output.tolist()
-        }
+        data = {name: self._views[name].tolist() for name, _ in LAYOUT}
         with open(filename, 'w') as f:
             json.dump(data, f)
         print(f"Brain saved to {filename}!")
@@ -51,10 +178,39 @@ class NeuralNetwork:
     def load(filename):
         with open(filename, 'r') as f:
             data = json.load(f)
-        nn = NeuralNetwork()
-        nn.weights_input_hidden = np.array(data['weights_input_hidden'])
-        nn.bias_hidden = np.array(data['bias_hidden'])
-        nn.weights_hidden_output = np.array(data['weights_hidden_output'])
-        nn.bias_output = np.array(data['bias_output'])
+        for name, shape in LAYOUT:
+            if name not in data or np.shape(data[name]) != shape:
+                raise ValueError(f"{filename} was saved for a different network topology (see HIDDEN_LAYERS)")
+        nn = NeuralNetwork(np.concatenate([np.ravel(data[name]) for name, _ in LAYOUT]).astype(GENOME_DTYPE))
         print(f"Brain loaded from {filename}!")
-        return nn
\ No newline at end of file
+        return nn
+
+
+# The weights and biases of every layer are attributes, e.g. brain.weights_input_hidden
+for _name in PARAM_SLICES:
+    setattr(NeuralNetwork, _name, _param(_name))
+
+
+class BatchedNetwork:
+    """
+    Every genome of a population viewed as 3-D tensors so that the
+    whole population decides in one matmul per layer. Gives exactly the
+    same outputs as calling NeuralNetwork.forward bird by bird.
+    """
+
+    def __init__(self, genomes):
+        # genomes: (population, GENOME_SIZE); the tensors are views into it
+        count = len(genomes)
+        for name, (index, shape) in PARAM_SLICES.items():
+            setattr(self, name, genomes[:, index].reshape((count,) + shape))
+        self.layers = [(getattr(self, weights), getattr(self, bias), activation)
+                       for weights, bias, activation in LAYERS]
+
+    def plan(self, batch_shape):
+        """InferencePlan for inputs shaped batch_shape + (INPUT_SIZE,), e.g. (population,)."""
+        return InferencePlan(self.layers, batch_shape)
+
+    def forward(self, inputs):
+        # inputs: (..., population, INPUT_SIZE) -> outputs: (..., population, OUTPUT_SIZE);
+        # leading axes (e.g. several courses) share the population's weights
+        return self.plan(inputs.shape[:-1]).run(inputs)
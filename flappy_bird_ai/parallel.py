@@ -0,0 +1,129 @@
+# ===========================================
+# PARALLEL EVALUATION - Multi-Core Fitness
+# ===========================================
+
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+import numpy as np
+from neural_network import GENOME_SIZE
+from pipe import PipeManager
+from population import Population
+from simulator import create_simulator
+
+
+def _attach(name):
+    shm = shared_memory.SharedMemory(name=name)
+    # Workers only borrow the block; the parent process owns and unlinks it
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    except Exception:
+        pass
+    return shm
+
+
+def _evaluate_shard(genomes_name, results_name, count, dtype, start, stop, seed,
+                    max_ticks, max_pipes, decision_interval, jit):
+    genomes_shm = _attach(genomes_name)
+    results_shm = _attach(results_name)
+    genomes = results = None
+    try:
+        genomes = np.ndarray((count, GENOME_SIZE), dtype=dtype, buffer=genomes_shm.buf)
+        results = np.ndarray((3, count), dtype=np.int64, buffer=results_shm.buf)
+
+        # Every shard sees the same pipe course
+        simulator = create_simulator(Population(genomes[start:stop].copy()), PipeManager(seed), decision_interval,
+                                     jit=jit)
+        simulator.run(max_ticks, max_pipes)
+
+        results[0, start:stop] = simulator.population.fitness
+        results[1, start:stop] = simulator.population.score
+        results[2, start:stop] = simulator.population.alive
+        return simulator.ticks, simulator.termination
+    finally:
+        del genomes, results
+        genomes_shm.close()
+        results_shm.close()
+
+
+class ParallelEvaluator:
+    """
+    Splits a population across a pool of worker processes. Genomes go to
+    the workers and fitness/score come back through shared memory, so
+    nothing but a few integers is pickled per generation.
+    """
+
+    def __init__(self, workers=None, decision_interval=1, jit=False):
+        self.workers = workers or os.cpu_count() or 1
+        self.decision_interval = decision_interval
+        self.jit = jit
+        self.pool = multiprocessing.Pool(self.workers)
+        self._genomes_shm = None
+        self._results_shm = None
+        self._count = 0
+        self._dtype = None
+
+    def _allocate(self, count, dtype):
+        if count == self._count and dtype == self._dtype:
+            return
+        self._release()
+        self._genomes_shm = shared_memory.SharedMemory(create=True, size=count * GENOME_SIZE * dtype.itemsize)
+        self._results_shm = shared_memory.SharedMemory(create=True, size=3 * count * 8)
+        self._count = count
+        self._dtype = dtype
+
+    def _release(self):
+        for shm in (self._genomes_shm, self._results_shm):
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+        self._genomes_shm = None
+        self._results_shm = None
+        self._count = 0
+        self._dtype = None
+
+    def evaluate(self, population, seed, max_ticks=None, max_pipes=None):
+        """
+        Run every bird of the population through the course generated by
+        seed. Fitness, score and alive flags are written back into the
+        population; returns the number of ticks the longest shard ran and
+        why the generation ended (see Simulator.check_budget).
+        """
+        count = len(population)
+        dtype = population.genomes.dtype
+        self._allocate(count, dtype)
+
+        genomes = np.ndarray((count, GENOME_SIZE), dtype=dtype, buffer=self._genomes_shm.buf)
+        genomes[:] = population.genomes
+        results = np.ndarray((3, count), dtype=np.int64, buffer=self._results_shm.buf)
+
+        bounds = np.linspace(0, count, min(self.workers, count) + 1).astype(int)
+        tasks = [
+            (self._genomes_shm.name, self._results_shm.name, count, dtype.str, int(start), int(stop), seed,
+             max_ticks, max_pipes, self.decision_interval, self.jit)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+            if stop > start
+        ]
+        outcomes = self.pool.starmap(_evaluate_shard, tasks)
+
+        population.fitness[:] = results[0]
+        population.score[:] = results[1]
+        population.alive[:] = results[2].astype(bool)
+        del genomes, results
+
+        # Every shard flies the same course, so a budget hit anywhere caps the generation
+        ticks = max((t for t, _ in outcomes), default=0)
+        capped = [reason for _, reason in outcomes if reason != 'extinct']
+        return ticks, capped[0] if capped else 'extinct'
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
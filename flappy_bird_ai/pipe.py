@@ -2,18 +2,29 @@
 # PIPE CLASS - The Obstacles
 # ===========================================
 
-import pygame
 import random
+import numpy as np
 from config import *
+from population import Population
+
+MIN_GAP_TOP = 80
+MAX_GAP_TOP = SCREEN_HEIGHT - 50 - PIPE_GAP - 80
+
+
+def generate_course(seed, count):
+    """
+    Precompute the gap positions of the first count pipes that
+    PipeManager(seed) would spawn, as an array.
+    """
+    rng = random.Random(seed)
+    return np.array([rng.randint(MIN_GAP_TOP, MAX_GAP_TOP) for _ in range(count)], dtype=np.int64)
+
 
 class Pipe:
-    def __init__(self, x=None):
+    def __init__(self, x=None, gap_top=None, rng=random):
         self.x = x if x is not None else SCREEN_WIDTH
         
-        min_gap_top = 80
-        max_gap_top = SCREEN_HEIGHT - 50 - PIPE_GAP - 80
-        
-        self.gap_top = random.randint(min_gap_top, max_gap_top)
+        self.gap_top = gap_top if gap_top is not None else rng.randint(MIN_GAP_TOP, MAX_GAP_TOP)
         self.gap_bottom = self.gap_top + PIPE_GAP
         self.passed = False
     
@@ -42,70 +53,156 @@ class Pipe:
         return False
     
     def draw(self, screen):
-        # Top pipe
-        top_pipe_rect = pygame.Rect(self. x, 0, PIPE_WIDTH, self.gap_top)
-        pygame.draw.rect(screen, GREEN, top_pipe_rect)
-        
-        # Top cap
-        top_cap_rect = pygame.Rect(self.x - 5, self.gap_top - 20, PIPE_WIDTH + 10, 20)
-        pygame.draw.rect(screen, GREEN, top_cap_rect)
-        
-        # Bottom pipe
-        bottom_pipe_rect = pygame. Rect(self.x, self.gap_bottom, PIPE_WIDTH, SCREEN_HEIGHT - 50 - self.gap_bottom)
-        pygame.draw.rect(screen, GREEN, bottom_pipe_rect)
-        
-        # Bottom cap
-        bottom_cap_rect = pygame.Rect(self.x - 5, self. gap_bottom, PIPE_WIDTH + 10, 20)
-        pygame.draw.rect(screen, GREEN, bottom_cap_rect)
-        
-        # Dark edges
-        pygame.draw.rect(screen, (20, 100, 20), top_pipe_rect, 3)
-        pygame.draw.rect(screen, (20, 100, 20), bottom_pipe_rect, 3)
-        pygame.draw.rect(screen, (20, 100, 20), top_cap_rect, 3)
-        pygame.draw.rect(screen, (20, 100, 20), bottom_cap_rect, 3)
+        # Body and caps are pre-rendered once; pygame is only needed to draw
+        from sprites import draw_pipe
+        draw_pipe(screen, self.x, self.gap_top, self.gap_bottom)
 
 
 class PipeManager:
-    def __init__(self):
-        self.pipes = []
-        self. spawn_timer = PIPE_SPAWN_RATE - 30  # Spawn first pipe sooner
+    """
+    Keeps every pipe on screen as parallel arrays (x, gap_top, gap_bottom,
+    passed) so collisions and passes are checked for the whole population
+    with broadcast comparisons.
+    
+    Gap positions come from seed (a private random.Random) or, when no
+    seed was ever given, the global random module. A precomputed course
+    array is used first if one is passed.
+    """
+    
+    def __init__(self, seed=None, course=None):
+        self.rng = random
+        self.reset(seed, course)
+    
+    @property
+    def pipes(self):
+        # Pipe objects for drawing and per-bird code; changes to them are not stored
+        pipes = []
+        for x, gap_top, passed in zip(self.x.tolist(), self.gap_top.tolist(), self.passed.tolist()):
+            pipe = Pipe(x, gap_top)
+            pipe.passed = passed
+            pipes.append(pipe)
+        return pipes
     
     def update(self):
-        for pipe in self.pipes:
-            pipe. update()
+        self.advance(1)
+    
+    def advance(self, ticks):
+        """
+        Same as calling update() ticks times, provided no pipe is due to
+        spawn before the last of those ticks.
+        """
+        self.x -= PIPE_SPEED * ticks
         
-        self.pipes = [pipe for pipe in self. pipes if not pipe.is_off_screen()]
+        # Same test as Pipe.is_off_screen
+        on_screen = self.x + PIPE_WIDTH >= 0
+        if not on_screen.all():
+            self.x = self.x[on_screen]
+            self.gap_top = self.gap_top[on_screen]
+            self.gap_bottom = self.gap_bottom[on_screen]
+            self.passed = self.passed[on_screen]
         
-        self.spawn_timer += 1
+        self.spawn_timer += ticks
         if self.spawn_timer >= PIPE_SPAWN_RATE: 
-            self.pipes.append(Pipe())
+            self.spawn(Pipe(gap_top=self._next_gap_top()))
             self.spawn_timer = 0
     
+    def ticks_until_spawn(self):
+        return max(PIPE_SPAWN_RATE - self.spawn_timer, 1)
+    
+    def _next_gap_top(self):
+        if self.course is not None and self.spawned < len(self.course):
+            gap_top = int(self.course[self.spawned])
+        else:
+            gap_top = self.rng.randint(MIN_GAP_TOP, MAX_GAP_TOP)
+        self.spawned += 1
+        return gap_top
+    
+    def upcoming_gap_tops(self, count):
+        """
+        Gap positions of the next count pipes to spawn, without using them
+        up: the random stream is rewound afterwards.
+        """
+        state, spawned = self.rng.getstate(), self.spawned
+        gap_tops = np.array([self._next_gap_top() for _ in range(count)], dtype=np.int64)
+        self.rng.setstate(state)
+        self.spawned = spawned
+        return gap_tops
+    
+    def skip_spawns(self, count):
+        # Use up the gaps of pipes spawned elsewhere (see JitSimulator)
+        for _ in range(count):
+            self._next_gap_top()
+    
+    def spawn(self, pipe):
+        self.x = np.append(self.x, pipe.x)
+        self.gap_top = np.append(self.gap_top, pipe.gap_top)
+        self.gap_bottom = np.append(self.gap_bottom, pipe.gap_bottom)
+        self.passed = np.append(self.passed, pipe.passed)
+    
     def draw(self, screen):
-        for pipe in self.pipes:
-            pipe.draw(screen)
+        # Straight from the arrays, without building Pipe objects
+        from sprites import draw_pipe
+        for x, gap_top, gap_bottom in zip(self.x.tolist(), self.gap_top.tolist(), self.gap_bottom.tolist()):
+            draw_pipe(screen, x, gap_top, gap_bottom)
+    
+    def collision_mask(self, x, y):
+        """
+        Bird-by-pipe version of Pipe.collides_with: returns True for every
+        bird whose box overlaps a pipe outside its gap.
+        """
+        x = x[..., None]
+        y = y[..., None]
+        overlaps = (x + BIRD_RADIUS > self.x) & (x - BIRD_RADIUS < self.x + PIPE_WIDTH)
+        outside_gap = (y - BIRD_RADIUS < self.gap_top) | (y + BIRD_RADIUS > self.gap_bottom)
+        return (overlaps & outside_gap).any(axis=-1)
+    
+    def mark_passed(self, x, alive):
+        """Flag pipes that a living bird has cleared; returns how many were new."""
+        if not alive.any():
+            return 0
+        cleared = ~self.passed & (x[alive].max() > self.x + PIPE_WIDTH)
+        self.passed |= cleared
+        return int(np.count_nonzero(cleared))
     
     def check_collisions(self, birds):
-        for bird in birds: 
-            if not bird.alive:
-                continue
-            for pipe in self.pipes:
-                if pipe.collides_with(bird):
-                    bird.die()
+        if isinstance(birds, Population):
+            dead = birds.alive & self.collision_mask(birds.x, birds.y)
+            birds.alive[dead] = False
+            return
+        
+        alive = np.array([bird.alive for bird in birds], dtype=bool)
+        x = np.array([bird.x for bird in birds], dtype=np.float64)
+        y = np.array([bird.y for bird in birds], dtype=np.float64)
+        dead = alive & self.collision_mask(x, y)
+        for bird in np.array(birds, dtype=object)[dead]:
+            bird.die()
     
     def check_passed(self, birds):
-        for pipe in self.pipes:
-            if pipe.passed:
-                continue
-            for bird in birds:
-                if bird.alive and bird.x > pipe.x + PIPE_WIDTH:
-                    pipe.passed = True
-                    for b in birds:
-                        if b.alive:
-                            b. score += 1
-                            b.fitness += 100
-                    break
-    
-    def reset(self):
-        self.pipes = []
-        self.spawn_timer = PIPE_SPAWN_RATE - 30  # Spawn first pipe sooner
\ No newline at end of file
+        if isinstance(birds, Population):
+            passed = self.mark_passed(birds.x, birds.alive)
+            if passed:
+                birds.score[birds.alive] += passed
+                birds.fitness[birds.alive] += 100 * passed
+            return
+        
+        alive = np.array([bird.alive for bird in birds], dtype=bool)
+        x = np.array([bird.x for bird in birds], dtype=np.float64)
+        passed = self.mark_passed(x, alive)
+        if passed:
+            for b in birds:
+                if b.alive:
+                    b.score += passed
+                    b.fitness += 100 * passed
+    
+    def reset(self, seed=None, course=None):
+        # Without a new seed the current random stream just carries on
+        if seed is not None:
+            self.rng = random.Random(seed)
+        self.course = course
+        self.spawned = 0
+        
+        self.x = np.empty(0, dtype=np.int64)
+        self.gap_top = np.empty(0, dtype=np.int64)
+        self.gap_bottom = np.empty(0, dtype=np.int64)
+        self.passed = np.empty(0, dtype=bool)
+        self.spawn_timer = PIPE_SPAWN_RATE - 30  # Spawn first pipe sooner
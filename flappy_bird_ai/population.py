@@ -0,0 +1,167 @@
+# ===========================================
+# POPULATION - Structure-of-Arrays Bird State
+# ===========================================
+
+import numpy as np
+from config import *
+from bird import Bird
+from neural_network import NeuralNetwork, BatchedNetwork
+from sensors import SensorPipeline
+
+GROUND_Y = SCREEN_HEIGHT - 50
+
+
+def update_physics(y, velocity, alive, fitness):
+    """
+    Batched version of Bird.update. Works on arrays of any shape and
+    modifies them in place; dead birds are left untouched.
+    """
+    np.add(velocity, GRAVITY, out=velocity, where=alive)
+    np.add(y, velocity, out=y, where=alive)
+    fitness += alive
+
+    # Ceiling
+    hit_ceiling = alive & (y - BIRD_RADIUS <= 0)
+    y[hit_ceiling] = BIRD_RADIUS
+    velocity[hit_ceiling] = 0
+
+    # Ground
+    hit_ground = alive & (y + BIRD_RADIUS >= GROUND_Y)
+    y[hit_ground] = GROUND_Y - BIRD_RADIUS
+    alive[hit_ground] = False
+
+
+def coast(y, velocity, ticks):
+    """
+    Closed-form flight of birds that do not flap for the next ticks ticks.
+    Returns (positions, velocities), each shaped (birds, ticks), after
+    every tick. A bird that touches the ceiling is clamped there and then
+    falls from rest, exactly as Bird.update does tick by tick.
+    """
+    t = np.arange(1, ticks + 1)
+    positions = y[:, None] + velocity[:, None] * t + GRAVITY * t * (t + 1) / 2
+    velocities = velocity[:, None] + GRAVITY * t
+
+    # Ceiling: at most one touch, since a bird at rest only falls afterwards
+    touched = positions - BIRD_RADIUS <= 0
+    hit = touched.any(axis=1)
+    if hit.any():
+        since = t - (touched[hit].argmax(axis=1)[:, None] + 1)
+        falling = since >= 0
+        positions[hit] = np.where(falling, BIRD_RADIUS + GRAVITY * since * (since + 1) / 2, positions[hit])
+        velocities[hit] = np.where(falling, GRAVITY * since, velocities[hit])
+
+    return positions, velocities
+
+
+def _column(name):
+    def get(self):
+        return getattr(self.population, name)[self.index]
+
+    def set(self, value):
+        getattr(self.population, name)[self.index] = value
+
+    return property(get, set)
+
+
+class PopulationBird(Bird):
+    """A Bird whose state is one row of a Population's arrays."""
+
+    x = _column('x')
+    y = _column('y')
+    velocity = _column('velocity')
+    alive = _column('alive')
+    fitness = _column('fitness')
+    score = _column('score')
+
+    def __init__(self, population, index, neural_network):
+        self.population = population
+        self.index = index
+        self.brain = neural_network
+
+
+class Population:
+    """
+    Holds the state of every bird as contiguous NumPy arrays so that
+    physics runs as a handful of array operations per tick instead of
+    a Python loop over Bird objects.
+    """
+
+    def __init__(self, genomes):
+        size = len(genomes)
+        self.x = np.full(size, BIRD_X, dtype=np.float64)
+        self.y = np.full(size, SCREEN_HEIGHT // 2, dtype=np.float64)
+        self.velocity = np.zeros(size, dtype=np.float64)
+        self.alive = np.ones(size, dtype=bool)
+        self.fitness = np.zeros(size, dtype=np.int64)
+        self.score = np.zeros(size, dtype=np.int64)
+
+        # One (population, GENOME_SIZE) matrix; brains and network are views of it
+        self.genomes = genomes
+        self._brains = None
+        self._birds = None
+        self.network = BatchedNetwork(genomes)
+        # Every think() reuses the same input, layer and output buffers
+        self.plan = self.network.plan((size,))
+        self.inputs = self.plan.inputs
+        self.sensors = SensorPipeline()
+
+    @classmethod
+    def from_birds(cls, birds):
+        population = cls(np.stack([bird.brain.params for bird in birds]))
+        for i, bird in enumerate(birds):
+            population.x[i] = bird.x
+            population.y[i] = bird.y
+            population.velocity[i] = bird.velocity
+            population.alive[i] = bird.alive
+            population.fitness[i] = bird.fitness
+            population.score[i] = bird.score
+        return population
+
+    # Per-bird objects are only built when something asks for them (drawing,
+    # saving a brain); headless training never does
+    @property
+    def brains(self):
+        if self._brains is None:
+            self._brains = [NeuralNetwork(row) for row in self.genomes]
+        return self._brains
+
+    @property
+    def birds(self):
+        if self._birds is None:
+            self._birds = [PopulationBird(self, i, brain) for i, brain in enumerate(self.brains)]
+        return self._birds
+
+    def __len__(self):
+        return len(self.alive)
+
+    @property
+    def alive_count(self):
+        return int(np.count_nonzero(self.alive))
+
+    def best_index(self):
+        return int(np.argmax(self.fitness))
+
+    def top_alive(self, count=None):
+        """Indices of the alive birds, or of the count fittest of them."""
+        alive = np.flatnonzero(self.alive)
+        if count is None or count >= len(alive):
+            return alive
+        return alive[np.argpartition(-self.fitness[alive], count - 1)[:count]]
+
+    def flap(self, mask):
+        self.velocity[mask & self.alive] = FLAP_STRENGTH
+
+    def think(self, frame):
+        """Batched Bird.think: every bird reads the same pipe sensor frame."""
+        if frame is None or len(self) == 0:
+            return
+
+        # Neural network inputs
+        self.sensors.fill(self.inputs, self.y, self.velocity, frame)
+
+        output = self.plan.run()
+        self.flap(output[:, 0] > 0.5)
+
+    def update(self):
+        update_physics(self.y, self.velocity, self.alive, self.fitness)
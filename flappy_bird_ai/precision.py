@@ -0,0 +1,141 @@
+# ===========================================
+# PRECISION - Reduced-Precision Validation
+# ===========================================
+
+import argparse
+import random
+import numpy as np
+from config import GENOME_DTYPE, STORAGE_DTYPE, MAX_TICKS_PER_GENERATION
+from neural_network import BatchedNetwork
+from population import Population
+from pipe import PipeManager
+from simulator import Simulator, Trainer
+from checkpoint import load_checkpoint
+from archive import GenomeArchive
+
+REFERENCE_DTYPE = 'float64'
+
+
+def precision_variants(genomes, dtypes=('float32', 'float16'), storage_dtype=STORAGE_DTYPE):
+    """
+    (label, genomes) of every precision to compare with float64: the
+    genomes computed in each of dtypes, and stored as storage_dtype then
+    computed in GENOME_DTYPE, as a checkpoint or archive round trip does.
+    """
+    variants = [(np.dtype(dtype).name, genomes.astype(dtype)) for dtype in dtypes]
+    if np.dtype(storage_dtype) != np.dtype(GENOME_DTYPE):
+        variants.append((f'{np.dtype(storage_dtype).name} stored, {np.dtype(GENOME_DTYPE).name} computed',
+                         genomes.astype(storage_dtype).astype(GENOME_DTYPE)))
+    return variants
+
+
+def decision_agreement(genomes, seed, variants, max_ticks=None):
+    """
+    Fly genomes in float64 over the course generated by seed and, at every
+    tick, let each variant decide on the same inputs as the float64
+    birds. The float64 run alone steers the birds, so the states compared
+    stay the same however often a variant disagrees. Returns the number
+    of decisions of living birds and {label: how many of them agreed}.
+    """
+    simulator = Simulator(Population(genomes.astype(REFERENCE_DTYPE)), PipeManager(seed))
+    population = simulator.population
+    plans = [(label, BatchedNetwork(variant).plan((len(variant),))) for label, variant in variants]
+    agreed = {label: 0 for label, _ in variants}
+    decisions = 0
+
+    while simulator.check_budget(max_ticks) is None:
+        frame = simulator.sensor_frame()
+        if frame is not None:
+            population.sensors.fill(population.inputs, population.y, population.velocity, frame)
+            alive = population.alive
+            reference = population.plan.run()[alive, 0] > 0.5
+            decisions += len(reference)
+            for label, plan in plans:
+                agreed[label] += np.count_nonzero((plan.run(population.inputs)[alive, 0] > 0.5) == reference)
+        simulator.step()
+    return decisions, agreed
+
+
+def fitness_agreement(genomes, seed, variants, max_ticks=None):
+    """
+    Fly the float64 genomes and every variant on their own over the same
+    course. Returns {label: share of birds whose fitness matches float64}.
+    """
+    def fly(variant):
+        simulator = Simulator(Population(variant), PipeManager(seed))
+        simulator.run(max_ticks)
+        return simulator.population.fitness
+
+    reference = fly(genomes.astype(REFERENCE_DTYPE))
+    return {label: np.mean(fly(variant) == reference) for label, variant in variants}
+
+
+def validate(genomes, seeds, max_ticks=None, dtypes=('float32', 'float16'), storage_dtype=STORAGE_DTYPE):
+    """
+    Decision and fitness agreement of genomes with their float64 results
+    over the courses of seeds, per precision variant, as {label:
+    {'decisions', 'agreed', 'agreement', 'fitness_match'}}.
+    """
+    variants = precision_variants(genomes, dtypes, storage_dtype)
+    results = {label: {'decisions': 0, 'agreed': 0, 'fitness_match': 0.0} for label, _ in variants}
+    for seed in seeds:
+        decisions, agreed = decision_agreement(genomes, seed, variants, max_ticks)
+        matches = fitness_agreement(genomes, seed, variants, max_ticks)
+        for label, result in results.items():
+            result['decisions'] += decisions
+            result['agreed'] += agreed[label]
+            result['fitness_match'] += matches[label] / len(seeds)
+    for result in results.values():
+        result['agreement'] = result['agreed'] / result['decisions'] if result['decisions'] else 1.0
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare float32/float16 decisions with float64")
+    parser.add_argument("--checkpoint", default=None,
+                        help="validate the genomes of this checkpoint")
+    parser.add_argument("--archive", default=None,
+                        help="validate genomes from this archive directory")
+    parser.add_argument("--generation", type=int, default=None,
+                        help="archived generation to validate (default: the newest)")
+    parser.add_argument("--generations", type=int, default=30,
+                        help="without --checkpoint or --archive, train this many generations first")
+    parser.add_argument("--courses", type=int, default=3,
+                        help="seeded courses to fly the genomes over")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS_PER_GENERATION or 5000,
+                        help="stop each course after this many ticks")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed for training and the courses")
+    return parser.parse_args()
+
+
+def load_genomes(args):
+    if args.checkpoint:
+        return load_checkpoint(args.checkpoint)['genomes'], f"checkpoint {args.checkpoint}"
+    if args.archive:
+        archive = GenomeArchive(args.archive)
+        generation = max(archive.generations) if args.generation is None else args.generation
+        return np.array(archive.generation(generation)[0]), f"generation {generation} of {args.archive}"
+    trainer = Trainer(seed=args.seed)
+    trainer.train(args.generations, max_ticks=args.max_ticks)
+    return trainer.simulator.population.genomes, f"{args.generations} trained generations"
+
+
+def main():
+    args = parse_args()
+    genomes, source = load_genomes(args)
+    rng = random.Random(args.seed)
+    seeds = [rng.randrange(2 ** 32) for _ in range(args.courses)]
+    results = validate(genomes, seeds, args.max_ticks)
+
+    decisions = next(iter(results.values()))['decisions']
+    print(f"{len(genomes)} genomes ({source}, {genomes.dtype}), {decisions:,} decisions "
+          f"over {args.courses} courses, compared with {REFERENCE_DTYPE}:")
+    for label, result in results.items():
+        print(f"  {label:<34} decisions agree {result['agreement']:9.4%} "
+              f"({result['decisions'] - result['agreed']:,} differ)   "
+              f"same fitness {result['fitness_match']:7.2%} of birds")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# ===========================================
+# PROFILER - Per-Phase Timing
+# ===========================================
+
+import csv
+import time
+from contextlib import nullcontext
+from config import *
+
+PHASES = ['events', 'think', 'physics', 'collisions', 'evolution', 'render', 'flip']
+
+# Shared no-op context returned while timing is off
+_OFF = nullcontext()
+
+
+class _Phase:
+    __slots__ = ('timer', 'name', 'start')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.timer.frame[self.name] = self.timer.frame.get(self.name, 0.0) + elapsed
+
+
+class PhaseTimer:
+    """
+    Wall time spent in each phase of the game loop, per frame and per
+    generation. Wrap code in `with timer.phase('think'):`; while the timer
+    is disabled that is a shared no-op context and nothing is recorded.
+    Frame averages feed the on-screen overlay, and every frame and
+    generation can be written to a CSV file.
+    """
+
+    def __init__(self, enabled=False, csv_path=None, smoothing=0.05):
+        self.enabled = False
+        self.smoothing = smoothing
+        self.frame = {}
+        self.generation_totals = {}
+        self.average = {}
+        self.frames = 0
+        self._phases = {name: _Phase(self, name) for name in PHASES}
+        self._csv_file = None
+        self._csv = None
+        self._labels = None
+        if enabled:
+            self.enable(csv_path)
+
+    def enable(self, csv_path=None):
+        self.enabled = True
+        if csv_path is not None and self._csv is None:
+            self._csv_file = open(csv_path, 'w', newline='')
+            self._csv = csv.writer(self._csv_file)
+            self._csv.writerow(['kind', 'index', 'frames'] + [f'{name}_ms' for name in PHASES])
+
+    def disable(self):
+        self.enabled = False
+        self.frame.clear()
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+            self._csv = None
+
+    def toggle(self, csv_path=None):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable(csv_path)
+        return self.enabled
+
+    def phase(self, name):
+        if not self.enabled:
+            return _OFF
+        if name not in self._phases:
+            self._phases[name] = _Phase(self, name)
+        return self._phases[name]
+
+    def _row(self, kind, index, frames, seconds):
+        if self._csv is not None:
+            self._csv.writerow([kind, index, frames] +
+                               [f"{seconds.get(name, 0.0) * 1000:.4f}" for name in PHASES])
+
+    def end_frame(self, log=True):
+        """
+        Close the current frame: update averages, totals and (with log)
+        the CSV. Headless, where a generation is a single frame, only the
+        generation row is worth logging.
+        """
+        if not self.enabled:
+            return
+        for name in set(self.frame) | set(self.average):
+            seconds = self.frame.get(name, 0.0)
+            self.generation_totals[name] = self.generation_totals.get(name, 0.0) + seconds
+            previous = self.average.get(name, seconds)
+            self.average[name] = previous + self.smoothing * (seconds - previous)
+        self.frames += 1
+        if log:
+            self._row('frame', self.frames, 1, self.frame)
+        self.frame.clear()
+
+    def end_generation(self, generation):
+        """Log the totals of a finished generation and start new ones."""
+        if not self.enabled:
+            return {}
+        totals = dict(self.generation_totals)
+        self._row('generation', generation, self.frames, totals)
+        self.generation_totals.clear()
+        self.frames = 0
+        return totals
+
+    def draw(self, screen, font, x, y):
+        """Overlay with the smoothed milliseconds per frame of each phase."""
+        if not self.enabled:
+            return
+        # Imported here so headless training runs without pygame
+        import pygame
+        from sprites import panel, Label
+        lines = [(name, self.average[name] * 1000) for name in PHASES if name in self.average]
+        total = sum(ms for _, ms in lines)
+        lines.append(('total', total))
+
+        # A label per row, re-rendered only when its text changes
+        if self._labels is None or self._labels[0].font is not font:
+            self._labels = [Label(font, YELLOW)]
+        while len(self._labels) <= len(lines):
+            self._labels.append(Label(font))
+
+        height = 25 + 20 * len(lines)
+        screen.blit(panel(170, height), (x, y))
+        pygame.draw.rect(screen, WHITE, (x, y, 170, height), 2)
+
+        screen.blit(self._labels[0].render("Profile (ms)"), (x + 10, y + 5))
+        for i, (name, ms) in enumerate(lines):
+            screen.blit(self._labels[i + 1].render(f"{name}: {ms:.2f}"), (x + 10, y + 25 + i * 20))
+
+    def close(self):
+        self.disable()
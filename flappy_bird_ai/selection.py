@@ -0,0 +1,102 @@
+# ===========================================
+# SELECTION - Parent Selection Operators
+# ===========================================
+
+import numpy as np
+
+# Every operator takes the fitness array of a generation, the number of
+# children to breed and a RandomState (or np.random), and returns two
+# index arrays (parent_a, parent_b) of that length into the population.
+# Parents for the whole offspring batch are drawn in a few array calls.
+
+
+def top_k(fitness, k):
+    """
+    Indices of the k fittest, best first, in O(n + k log k). Ties are
+    broken by index, exactly like a stable descending sort.
+    """
+    fitness = np.asarray(fitness)
+    k = min(k, len(fitness))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(fitness):
+        kth = np.partition(fitness, len(fitness) - k)[len(fitness) - k]
+        above = np.flatnonzero(fitness > kth)
+        ties = np.flatnonzero(fitness == kth)[:k - len(above)]
+        top = np.concatenate([above, ties])
+    else:
+        top = np.arange(len(fitness))
+    return top[np.argsort(-fitness[top], kind='stable')]
+
+
+def _sample(weights, count, rng):
+    # Fitness-proportional draws: one uniform per draw, located in the cumulative sum
+    cumulative = np.cumsum(weights, dtype=np.float64)
+    if cumulative[-1] <= 0:
+        return rng.randint(0, len(weights), count)
+    picks = np.searchsorted(cumulative, rng.rand(count) * cumulative[-1], side='right')
+    return np.minimum(picks, len(weights) - 1)
+
+
+def _shifted(fitness):
+    # Roulette needs non-negative weights
+    fitness = np.asarray(fitness, dtype=np.float64)
+    return fitness - min(fitness.min(), 0)
+
+
+def truncation(fitness, count, rng, num_parents=10, top_a=5):
+    """Only the num_parents fittest breed; the first parent comes from the top_a."""
+    parents = top_k(fitness, num_parents)
+    parent_a = parents[rng.randint(0, min(top_a, len(parents)), count)]
+    parent_b = parents[rng.randint(0, len(parents), count)]
+    return parent_a, parent_b
+
+
+def tournament(fitness, count, rng, size=3):
+    """Each parent is the fittest of `size` birds drawn at random."""
+    fitness = np.asarray(fitness)
+    contenders = rng.randint(0, len(fitness), (2, count, size))
+    winners = np.take_along_axis(contenders, fitness[contenders].argmax(axis=-1)[..., None], axis=-1)[..., 0]
+    return winners[0], winners[1]
+
+
+def rank(fitness, count, rng):
+    """Chance proportional to rank (worst = 1, best = n), not to raw fitness."""
+    order = np.argsort(fitness, kind='stable')
+    weights = np.empty(len(order), dtype=np.float64)
+    weights[order] = np.arange(1, len(order) + 1)
+    return _sample(weights, count, rng), _sample(weights, count, rng)
+
+
+def roulette(fitness, count, rng):
+    """Chance proportional to fitness."""
+    weights = _shifted(fitness)
+    return _sample(weights, count, rng), _sample(weights, count, rng)
+
+
+def stochastic_universal(fitness, count, rng):
+    """
+    Fitness-proportional like roulette, but all 2 * count parents come
+    from evenly spaced pointers with one random offset, so the number of
+    times a bird is picked stays close to its expected share.
+    """
+    cumulative = np.cumsum(_shifted(fitness))
+    total = cumulative[-1]
+    if total <= 0:
+        picks = rng.randint(0, len(cumulative), 2 * count)
+    else:
+        step = total / (2 * count)
+        pointers = rng.rand() * step + np.arange(2 * count) * step
+        picks = np.minimum(np.searchsorted(cumulative, pointers, side='right'), len(cumulative) - 1)
+        # Pointers are ordered by bird; shuffle so pairs are random
+        picks = picks[rng.permutation(2 * count)]
+    return picks[:count], picks[count:]
+
+
+SELECTIONS = {
+    'truncation': truncation,
+    'tournament': tournament,
+    'rank': rank,
+    'roulette': roulette,
+    'sus': stochastic_universal,
+}
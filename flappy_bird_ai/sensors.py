@@ -0,0 +1,86 @@
+# ===========================================
+# SENSORS - Neural Network Inputs
+# ===========================================
+
+import numpy as np
+from config import *
+
+# Every sensor a network input can read, scaled to roughly 0..1:
+#   y, velocity                 the bird's own height and speed
+#   gap_top, gap_bottom         edges of the next pipe's gap
+#   distance                    how far ahead the next pipe starts
+#   gap_top_2, gap_bottom_2,    the same for the pipe after that (a
+#   distance_2                  screen-high gap a screen away if none yet)
+SENSOR_NAMES = ['y', 'velocity', 'gap_top', 'gap_bottom', 'distance',
+                'gap_top_2', 'gap_bottom_2', 'distance_2']
+BIRD_SENSORS = ('y', 'velocity')
+
+
+class SensorPipeline:
+    """
+    Builds the network inputs of a whole population, one column per
+    sensor in the order given (SENSORS in config.py by default). Every
+    bird flies at BIRD_X, so the pipes ahead and everything read from
+    them are the same for all birds: pipe_frame() works them out once
+    per tick, and fill() broadcasts that frame next to each bird's own
+    height and velocity.
+    """
+
+    def __init__(self, names=SENSORS):
+        unknown = [name for name in names if name not in SENSOR_NAMES]
+        if unknown:
+            raise ValueError(f"Unknown sensors {unknown}, choose from {', '.join(SENSOR_NAMES)}")
+        self.names = list(names)
+        # How many pipes ahead the sensors look
+        self.lookahead = 2 if any(name.endswith('_2') for name in names) else 1
+
+    def pipe_frame(self, pipe_x, gap_top, gap_bottom):
+        """
+        Pipe sensor values for this tick as {name: value}, or None while
+        no pipe is ahead. pipe_x is sorted, as PipeManager keeps it;
+        gap_top and gap_bottom may have leading axes (one row per course),
+        and the values then have them too.
+        """
+        # First pipe whose right edge is still ahead of the birds
+        start = int(np.searchsorted(pipe_x, BIRD_X - PIPE_WIDTH, side='right'))
+        if start == len(pipe_x):
+            return None
+
+        frame = {}
+        for ahead in range(self.lookahead):
+            suffix = '_2' if ahead else ''
+            index = start + ahead
+            if index < len(pipe_x):
+                frame['gap_top' + suffix] = gap_top[..., index] / SCREEN_HEIGHT
+                frame['gap_bottom' + suffix] = gap_bottom[..., index] / SCREEN_HEIGHT
+                frame['distance' + suffix] = (pipe_x[index] - BIRD_X) / SCREEN_WIDTH
+            else:
+                frame['gap_top' + suffix] = 0.0
+                frame['gap_bottom' + suffix] = 1.0
+                frame['distance' + suffix] = 1.0
+        return frame
+
+    def bird_inputs(self, y, velocity, frame):
+        """The inputs of a single bird, as a list."""
+        own = {'y': y / SCREEN_HEIGHT, 'velocity': (velocity + 10) / 20}
+        return [own[name] if name in own else frame[name] for name in self.names]
+
+    def pipes_frame(self, pipes):
+        """pipe_frame() of a list of Pipe objects."""
+        return self.pipe_frame(np.array([pipe.x for pipe in pipes], dtype=np.int64),
+                               np.array([pipe.gap_top for pipe in pipes], dtype=np.int64),
+                               np.array([pipe.gap_bottom for pipe in pipes], dtype=np.int64))
+
+    def fill(self, inputs, y, velocity, frame):
+        """Write the inputs (..., population, sensors) in place."""
+        for column, name in enumerate(self.names):
+            out = inputs[..., column]
+            if name == 'y':
+                np.divide(y, SCREEN_HEIGHT, out=out)
+            elif name == 'velocity':
+                np.add(velocity, 10, out=out)
+                np.divide(out, 20, out=out)
+            else:
+                # One value per course, shared by its whole population
+                out[...] = np.asarray(frame[name])[..., None]
+        return inputs
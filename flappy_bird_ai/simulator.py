@@ -0,0 +1,374 @@
+# ===========================================
+# SIMULATOR - Headless Training Engine
+# ===========================================
+
+import random
+import numpy as np
+from config import *
+from pipe import PipeManager
+from population import Population, GROUND_Y, coast
+from genetic_algorithm import GeneticAlgorithm
+from profiler import PhaseTimer
+from multi_course import CourseBatch, aggregate
+import checkpoint
+
+
+class Simulator:
+    """
+    Steps a population of birds through the pipe course without any
+    window, fonts or frame-rate limit. The interactive viewer in main.py
+    drives the same object one tick at a time.
+    """
+
+    def __init__(self, population, pipe_manager=None, timer=None):
+        self.pipe_manager = pipe_manager if pipe_manager is not None else PipeManager()
+        # Records think/physics/collisions time when enabled
+        self.timer = timer if timer is not None else PhaseTimer()
+        self._load(population)
+
+    def _load(self, population):
+        # Accepts a Population or a plain list of Bird objects
+        if not isinstance(population, Population):
+            population = Population.from_birds(population)
+        self.population = population
+        self.ticks = 0
+        self.termination = None
+
+    def reset(self, population, seed=None, course=None):
+        self._load(population)
+        self.pipe_manager.reset(seed, course)
+
+    @property
+    def birds(self):
+        return self.population.birds
+
+    @property
+    def alive_count(self):
+        return self.population.alive_count
+
+    def best_bird(self):
+        return self.birds[self.population.best_index()]
+
+    def sensor_frame(self):
+        # Every bird flies at BIRD_X, so the pipes ahead are the same for all of them
+        pipes = self.pipe_manager
+        return self.population.sensors.pipe_frame(pipes.x, pipes.gap_top, pipes.gap_bottom)
+
+    def check_budget(self, max_ticks=None, max_pipes=None):
+        """
+        Why the current generation should end: 'extinct' when every bird
+        is dead, 'max_ticks' or 'max_pipes' when a budget ran out, or None
+        while it should go on.
+        """
+        if self.alive_count == 0:
+            return 'extinct'
+        if max_ticks is not None and self.ticks >= max_ticks:
+            return 'max_ticks'
+        if max_pipes is not None and self.population.score.max() >= max_pipes:
+            return 'max_pipes'
+        return None
+
+    def step(self):
+        timer = self.timer
+
+        # Birds think
+        with timer.phase('think'):
+            self.population.think(self.sensor_frame())
+
+        # Update birds and pipes
+        with timer.phase('physics'):
+            self.population.update()
+            self.pipe_manager.update()
+
+        # Check collisions
+        with timer.phase('collisions'):
+            self.pipe_manager.check_collisions(self.population)
+            self.pipe_manager.check_passed(self.population)
+
+        self.ticks += 1
+        return self.alive_count
+
+    def _advance(self, max_ticks):
+        self.step()
+
+    def run(self, max_ticks=None, max_pipes=None):
+        """
+        Step until every bird is dead or a budget runs out. The reason is
+        left in self.termination; returns the number of ticks simulated.
+        """
+        while True:
+            self.termination = self.check_budget(max_ticks, max_pipes)
+            if self.termination is not None:
+                return self.ticks
+            self._advance(None if max_ticks is None else max_ticks - self.ticks)
+
+
+class FastForwardSimulator(Simulator):
+    """
+    Event-driven Simulator. Birds decide once per stretch of at most
+    decision_interval ticks; in between only gravity acts on them, so a
+    whole stretch is computed in closed form and checked against the
+    pipes with array operations. A stretch also ends when a pipe spawns
+    or the next pipe changes, so with decision_interval=1 the results are
+    identical to Simulator. Larger intervals trade reaction time for
+    speed: a flap the network would have asked for mid-stretch is skipped.
+    """
+
+    def __init__(self, population, pipe_manager=None, decision_interval=4, timer=None):
+        super().__init__(population, pipe_manager, timer)
+        self.decision_interval = decision_interval
+
+    def _stretch(self, max_ticks):
+        pipes = self.pipe_manager
+        ticks = min(self.decision_interval, pipes.ticks_until_spawn())
+        if max_ticks is not None:
+            ticks = min(ticks, max_ticks)
+
+        # The next pipe changes once its right edge has moved past the birds
+        ahead = pipes.x + PIPE_WIDTH > BIRD_X
+        if ahead.any():
+            distance = pipes.x[np.argmax(ahead)] + PIPE_WIDTH - BIRD_X
+            ticks = min(ticks, -(-distance // PIPE_SPEED))
+        return max(int(ticks), 1)
+
+    def advance(self, max_ticks=None):
+        """Think once, then fly one stretch. Returns the alive count."""
+        population = self.population
+        pipes = self.pipe_manager
+        timer = self.timer
+
+        # Birds think
+        with timer.phase('think'):
+            population.think(self.sensor_frame())
+
+        with timer.phase('physics'):
+            ticks = self._stretch(max_ticks)
+            t = np.arange(1, ticks + 1)
+            alive = np.flatnonzero(population.alive)
+            positions, velocities = coast(population.y[alive], population.velocity[alive], ticks)
+
+            # Ground
+            grounded = positions + BIRD_RADIUS >= GROUND_Y
+
+        with timer.phase('collisions'):
+            self._collide(population, pipes, ticks, t, alive, positions, velocities, grounded)
+
+        with timer.phase('physics'):
+            pipes.advance(ticks)
+        self.ticks += ticks
+        return self.alive_count
+
+    def _collide(self, population, pipes, ticks, t, alive, positions, velocities, grounded):
+        # Pipes: tightest gap overlapping the birds at each tick
+        pipe_x = pipes.x[:, None] - PIPE_SPEED * t
+        overlaps = (BIRD_X + BIRD_RADIUS > pipe_x) & (BIRD_X - BIRD_RADIUS < pipe_x + PIPE_WIDTH)
+        gap_top = np.where(overlaps, pipes.gap_top[:, None], -np.inf).max(axis=0, initial=-np.inf)
+        gap_bottom = np.where(overlaps, pipes.gap_bottom[:, None], np.inf).min(axis=0, initial=np.inf)
+        crashed = (positions - BIRD_RADIUS < gap_top) | (positions + BIRD_RADIUS > gap_bottom)
+
+        # First tick each bird dies on (ticks + 1 if it survives)
+        dying = grounded | crashed
+        death = np.where(dying.any(axis=1), dying.argmax(axis=1) + 1, ticks + 1)
+        last = np.minimum(death, ticks) - 1
+        rows = np.arange(len(alive))
+
+        y = positions[rows, last]
+        y[grounded[rows, last]] = GROUND_Y - BIRD_RADIUS
+        population.y[alive] = y
+        population.velocity[alive] = velocities[rows, last]
+        population.fitness[alive] += last + 1
+        population.alive[alive] = death > ticks
+
+        # Pipes cleared during the stretch reward the birds alive at that tick
+        cleared = ~pipes.passed[:, None] & (BIRD_X > pipe_x + PIPE_WIDTH)
+        new = cleared.any(axis=1)
+        if new.any():
+            passed_at = cleared[new].argmax(axis=1) + 1
+            witnessed = (death[:, None] > passed_at).any(axis=0)
+            pipes.passed[np.flatnonzero(new)[witnessed]] = True
+            rewards = (death[:, None] > passed_at[witnessed]).sum(axis=1)
+            population.score[alive] += rewards
+            population.fitness[alive] += 100 * rewards
+
+    def step(self):
+        return self.advance()
+
+    def _advance(self, max_ticks):
+        self.advance(max_ticks)
+
+
+def create_simulator(population, pipe_manager=None, decision_interval=1, timer=None, jit=False):
+    if decision_interval > 1:
+        return FastForwardSimulator(population, pipe_manager, decision_interval, timer)
+    if jit:
+        # Without numba this quietly stays on the NumPy path
+        from jit_simulator import JitSimulator, JIT_AVAILABLE
+        if JIT_AVAILABLE:
+            return JitSimulator(population, pipe_manager, timer)
+    return Simulator(population, pipe_manager, timer)
+
+
+class Trainer:
+    """
+    Evolves a population generation after generation, headless. With a
+    seed the whole run (initial genomes, evolution and every pipe course)
+    is reproducible. The best genome ever evaluated is kept as the
+    champion.
+    """
+
+    def __init__(self, ga=None, workers=1, seed=None, decision_interval=1, archive=None, timer=None,
+                 selection=SELECTION, courses=EVALUATION_COURSES, fitness_aggregate=FITNESS_AGGREGATE,
+                 fitness_quantile=FITNESS_QUANTILE, jit=False):
+        if courses > 1 and (workers != 1 or decision_interval > 1):
+            raise ValueError("Multi-course evaluation runs tick by tick in-process "
+                             "(workers=1, decision_interval=1)")
+        if jit and (courses > 1 or decision_interval > 1):
+            raise ValueError("The compiled kernel evaluates one course tick by tick "
+                             "(courses=1, decision_interval=1)")
+        if jit:
+            from jit_simulator import JIT_AVAILABLE, KERNEL_DTYPES
+            if not JIT_AVAILABLE:
+                print("numba is not installed, simulating with NumPy")
+            elif np.dtype(GENOME_DTYPE) not in KERNEL_DTYPES:
+                print(f"The compiled kernel has no {GENOME_DTYPE}, simulating with NumPy")
+        self.rng = random.Random(seed)
+        if ga is None:
+            ga = GeneticAlgorithm(self.rng.randrange(2 ** 32) if seed is not None else None,
+                                  selection=selection)
+        self.ga = ga
+        self.champion = None
+        self.champion_fitness = None
+        self.stop_reason = None
+        # Optional GenomeArchive that receives every evaluated generation
+        self.archive = archive
+        # Fitness over several courses at once, combined per genome
+        self.courses = courses
+        self.fitness_aggregate = fitness_aggregate
+        self.fitness_quantile = fitness_quantile
+        self.timer = timer if timer is not None else PhaseTimer()
+        self.simulator = create_simulator(Population(self.ga.create_initial_genomes()),
+                                          decision_interval=decision_interval, timer=self.timer, jit=jit)
+
+        # Spread evaluation over a process pool when asked to
+        self.evaluator = None
+        if workers != 1:
+            from parallel import ParallelEvaluator
+            self.evaluator = ParallelEvaluator(workers, decision_interval, jit)
+
+    def run_generation(self, max_ticks=MAX_TICKS_PER_GENERATION, max_pipes=MAX_PIPES_PER_GENERATION):
+        simulator = self.simulator
+        population = simulator.population
+
+        # Each generation flies new courses, derived from the trainer's seed
+        if self.courses > 1:
+            fitness, score = self._evaluate_courses(max_ticks, max_pipes)
+        else:
+            seed = self.rng.randrange(2 ** 32)
+            if self.evaluator is None:
+                simulator.pipe_manager.reset(seed)
+                simulator.run(max_ticks, max_pipes)
+            else:
+                simulator.ticks, simulator.termination = self.evaluator.evaluate(
+                    population, seed, max_ticks, max_pipes)
+            fitness, score = population.fitness, population.score
+
+        best = int(np.argmax(fitness))
+        stats = {
+            'generation': self.ga.generation,
+            'best_fitness': fitness[best].item(),
+            'avg_fitness': float(fitness.mean()),
+            'best_score': score[best].item(),
+            'ticks': simulator.ticks,
+            'termination': simulator.termination
+        }
+
+        if self.champion_fitness is None or stats['best_fitness'] > self.champion_fitness:
+            self.champion = population.genomes[best].copy()
+            self.champion_fitness = stats['best_fitness']
+
+        if self.archive is not None:
+            self.archive.append(self.ga.generation, population.genomes, fitness)
+
+        with self.timer.phase('evolution'):
+            simulator.reset(Population(self.ga.evolve(population.genomes, fitness,
+                                                      termination=simulator.termination)))
+
+        # Headless, a generation is one "frame" of the profile; only its generation row is logged
+        self.timer.end_frame(log=False)
+        stats['profile'] = self.timer.end_generation(stats['generation'])
+        return stats
+
+    def _evaluate_courses(self, max_ticks, max_pipes):
+        # Every genome flies self.courses seeded courses in one batch
+        simulator = self.simulator
+        seeds = [self.rng.randrange(2 ** 32) for _ in range(self.courses)]
+        batch = CourseBatch(simulator.population.genomes, seeds)
+        with self.timer.phase('physics'):
+            batch.run(max_ticks, max_pipes)
+        simulator.ticks, simulator.termination = batch.ticks, batch.termination
+        return (aggregate(batch.fitness, self.fitness_aggregate, self.fitness_quantile),
+                aggregate(batch.score, self.fitness_aggregate, self.fitness_quantile))
+
+    def train(self, generations, max_ticks=MAX_TICKS_PER_GENERATION, max_pipes=MAX_PIPES_PER_GENERATION,
+              plateau=PLATEAU_GENERATIONS, solved_score=SOLVED_SCORE, callback=None):
+        """
+        Evolve for up to the given number of generations. Training stops
+        early once a bird reaches solved_score, or when the best fitness
+        has not improved for plateau generations; self.stop_reason says
+        which ('generations', 'solved' or 'plateau').
+        """
+        self.stop_reason = 'generations'
+        stalled = 0
+        for _ in range(generations):
+            best_before = self.champion_fitness
+            stats = self.run_generation(max_ticks, max_pipes)
+            if callback is not None:
+                callback(stats)
+
+            if solved_score is not None and stats['best_score'] >= solved_score:
+                self.stop_reason = 'solved'
+                break
+
+            stalled = 0 if best_before is None or self.champion_fitness > best_before else stalled + 1
+            if plateau is not None and stalled >= plateau:
+                self.stop_reason = 'plateau'
+                break
+        return self.ga.get_stats()
+
+    def save(self, filename):
+        """Checkpoint the generation about to be evaluated and all GA state."""
+        checkpoint.save_checkpoint(filename, self.ga, self.simulator.population.genomes,
+                                   self.champion, self.champion_fitness, self.rng)
+
+    def resume(self, filename):
+        state = checkpoint.load_checkpoint(filename, seeded=self.ga.rng is not np.random)
+        self.ga = state['ga']
+        self.champion = state['champion']
+        self.champion_fitness = state['champion_fitness']
+        if state['course_rng'] is not None:
+            self.rng = state['course_rng']
+        self.simulator.reset(Population(state['genomes']))
+
+        # A run killed between checkpoints archived generations it will now evaluate again
+        if self.archive is not None:
+            dropped = self.archive.truncate(self.ga.generation)
+            if dropped:
+                print(f"Dropped archived generations {dropped[0]}-{dropped[-1]}, "
+                      f"newer than the checkpoint")
+
+    def reseed(self, generation):
+        """
+        Start the next generation from the genomes archived for an earlier
+        one. Numbering carries on after the newest archived generation, as
+        the archive is append-only.
+        """
+        if generation not in self.archive:
+            raise ValueError(f"Generation {generation} is not in the archive")
+        genomes, _ = self.archive.generation(generation)
+        self.simulator.reset(Population(np.array(genomes, dtype=GENOME_DTYPE)))
+        self.ga.generation = max(self.archive.generations) + 1
+
+    def close(self):
+        if self.evaluator is not None:
+            self.evaluator.close()
+            self.evaluator = None
@@ -0,0 +1,108 @@
+# ===========================================
+# SPRITES - Cached Surfaces for Drawing
+# ===========================================
+
+import pygame
+from config import *
+
+PIPE_EDGE = (20, 100, 20)
+PANEL_COLOR = (30, 30, 30)
+
+# Everything is drawn once on first use and reused every frame
+_cache = {}
+
+
+def _finish(surface):
+    # Match the display's pixel format once there is one, for faster blits
+    if pygame.display.get_surface() is not None:
+        return surface.convert_alpha()
+    return surface
+
+
+def bird_sprite(is_best=False):
+    """
+    The picture Bird.draw used to draw call by call. It is blitted with
+    its circle centre at the bird's position (see bird_position).
+    """
+    key = ('bird', is_best)
+    if key not in _cache:
+        sprite = pygame.Surface((2 * BIRD_RADIUS + 10, 2 * BIRD_RADIUS + 2), pygame.SRCALPHA)
+        x = y = BIRD_RADIUS
+
+        color = ORANGE if is_best else YELLOW
+        pygame.draw.circle(sprite, color, (x, y), BIRD_RADIUS)
+
+        # Eye
+        pygame.draw.circle(sprite, WHITE, (x + 5, y - 3), 5)
+        pygame.draw.circle(sprite, BLACK, (x + 7, y - 3), 2)
+
+        # Beak
+        pygame.draw.rect(sprite, ORANGE if not is_best else RED, (x + BIRD_RADIUS - 2, y + 2, 10, 5))
+        _cache[key] = _finish(sprite)
+    return _cache[key]
+
+
+def bird_position(x, y):
+    return int(x) - BIRD_RADIUS, int(y) - BIRD_RADIUS
+
+
+def draw_birds(screen, xs, ys, is_best=False):
+    """Draw many birds with a single blits() call."""
+    sprite = bird_sprite(is_best)
+    screen.blits([(sprite, bird_position(x, y)) for x, y in zip(xs, ys)], doreturn=False)
+
+
+def pipe_sprites():
+    """
+    (body, cap) surfaces for Pipe.draw. The body is a full-height pipe of
+    which only the visible part is blitted; the cap carries the body's
+    edges that used to be drawn over it.
+    """
+    if 'pipe' not in _cache:
+        body = pygame.Surface((PIPE_WIDTH, SCREEN_HEIGHT - 50), pygame.SRCALPHA)
+        body.fill(GREEN)
+        pygame.draw.rect(body, PIPE_EDGE, body.get_rect(), 3)
+
+        cap = pygame.Surface((PIPE_WIDTH + 10, 20), pygame.SRCALPHA)
+        cap.fill(GREEN)
+        pygame.draw.rect(cap, PIPE_EDGE, cap.get_rect(), 3)
+        pygame.draw.rect(cap, PIPE_EDGE, (5, 0, 3, 20))
+        pygame.draw.rect(cap, PIPE_EDGE, (PIPE_WIDTH + 2, 0, 3, 20))
+        _cache['pipe'] = _finish(body), _finish(cap)
+    return _cache['pipe']
+
+
+def draw_pipe(screen, x, gap_top, gap_bottom):
+    body, cap = pipe_sprites()
+    screen.blit(body, (x, 0), (0, 0, PIPE_WIDTH, gap_top))
+    screen.blit(body, (x, gap_bottom), (0, gap_bottom, PIPE_WIDTH, SCREEN_HEIGHT - 50 - gap_bottom))
+    screen.blit(cap, (x - 5, gap_top - 20))
+    screen.blit(cap, (x - 5, gap_bottom))
+
+
+def panel(width, height):
+    """Translucent HUD background of the given size."""
+    key = ('panel', width, height)
+    if key not in _cache:
+        surface = pygame.Surface((width, height))
+        surface.set_alpha(200)
+        surface.fill(PANEL_COLOR)
+        _cache[key] = surface
+    return _cache[key]
+
+
+class Label:
+    """A line of HUD text that is only re-rendered when it changes."""
+
+    def __init__(self, font, color=WHITE):
+        self.font = font
+        self.color = color
+        self._key = None
+        self.surface = None
+
+    def render(self, text, color=None):
+        key = (text, color or self.color)
+        if key != self._key:
+            self._key = key
+            self.surface = self.font.render(text, True, key[1])
+        return self.surface
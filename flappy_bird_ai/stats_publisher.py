@@ -0,0 +1,157 @@
+# ===========================================
+# STATS PUBLISHER - Background Metrics Output
+# ===========================================
+
+import os
+import sys
+import csv
+import queue
+import multiprocessing
+
+FIELDS = ['generation', 'best_fitness', 'avg_fitness', 'best_score', 'ticks', 'termination']
+
+
+def _has_display():
+    return sys.platform in ('win32', 'darwin') or bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def _open_plot(plot_path, live):
+    """
+    Set up matplotlib in the consumer process. Returns (pyplot, figure,
+    axes, live) or None when matplotlib is missing. Without a display
+    the plot is only saved to plot_path.
+    """
+    try:
+        import matplotlib
+    except ImportError:
+        print("matplotlib is not installed, writing statistics only")
+        return None
+
+    if live and not _has_display():
+        print("No display for the live plot, saving it to a file instead")
+        live = False
+    if not live:
+        matplotlib.use('Agg')
+
+    import matplotlib.pyplot as plt
+    try:
+        if live:
+            plt.ion()
+        figure, axes = plt.subplots(figsize=(8, 4))
+    except Exception as e:
+        # The interactive backend could not open a window
+        print(f"Could not open the live plot ({e}), saving it to a file instead")
+        plt.switch_backend('Agg')
+        live = False
+        figure, axes = plt.subplots(figsize=(8, 4))
+    return plt, figure, axes, live
+
+
+def _draw_plot(plot, history, plot_path):
+    plt, figure, axes, live = plot
+    axes.clear()
+    axes.plot(history['generation'], history['best_fitness'], color='green', label='Best')
+    axes.plot(history['generation'], history['avg_fitness'], color='royalblue', linestyle='--', label='Avg')
+    axes.set_xlabel('Generation')
+    axes.set_ylabel('Fitness')
+    axes.set_title('Fitness over generations')
+    axes.legend(loc='upper left')
+    if plot_path:
+        figure.savefig(plot_path)
+    if live:
+        plt.pause(0.001)
+
+
+def _consume(messages, csv_path, plot_path, plot_every, live):
+    # Runs in its own process: file output and plotting never block the game
+    csv_file = open(csv_path, 'w', newline='') if csv_path else None
+    writer = None
+    if csv_file is not None:
+        writer = csv.DictWriter(csv_file, FIELDS, extrasaction='ignore')
+        writer.writeheader()
+
+    plot = _open_plot(plot_path, live) if (plot_path or live) else None
+    history = {'generation': [], 'best_fitness': [], 'avg_fitness': []}
+    pending = 0
+
+    try:
+        while True:
+            stats = messages.get()
+            if stats is None:
+                break
+            if writer is not None:
+                writer.writerow(stats)
+                csv_file.flush()
+            for key in history:
+                history[key].append(stats[key])
+            pending += 1
+            if plot is not None and pending >= plot_every:
+                _draw_plot(plot, history, plot_path)
+                pending = 0
+        if plot is not None and pending:
+            _draw_plot(plot, history, plot_path)
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+
+
+class StatsPublisher:
+    """
+    Pushes per-generation statistics to a background process that writes
+    them to a CSV file and, if matplotlib is installed, plots best and
+    average fitness (saved every plot_every generations, or shown live).
+    publish() never blocks: if the consumer falls behind, stats are
+    dropped rather than stalling the simulation.
+    """
+
+    def __init__(self, csv_path=None, plot_path=None, plot_every=10, live=False, max_pending=1000):
+        self.messages = multiprocessing.Queue(max_pending)
+        self.dropped = 0
+        self.process = multiprocessing.Process(
+            target=_consume,
+            args=(self.messages, csv_path, plot_path, plot_every, live),
+            daemon=True
+        )
+        self.process.start()
+
+    def publish(self, stats):
+        try:
+            self.messages.put_nowait({key: stats[key] for key in FIELDS if key in stats})
+        except queue.Full:
+            self.dropped += 1
+            # A full queue is also how a dead consumer shows up
+            if self.dropped == 1 and self.process is not None and not self.process.is_alive():
+                self._report_exit()
+
+    def _report_exit(self):
+        print(f"Statistics process exited with code {self.process.exitcode}; "
+              "statistics and plots are no longer written")
+        # Nobody reads the queue any more, so do not wait for it to drain at exit
+        self.messages.cancel_join_thread()
+
+    def close(self, timeout=10):
+        """Let the consumer finish what is queued, then stop it."""
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            try:
+                self.messages.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            print("Statistics process did not finish in time, stopping it")
+            self.messages.cancel_join_thread()
+            self.process.terminate()
+            self.process.join()
+        elif self.process.exitcode != 0 and self.dropped == 0:
+            self._report_exit()
+        if self.dropped:
+            print(f"{self.dropped} generations of statistics were dropped")
+        self.process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
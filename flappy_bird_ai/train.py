@@ -0,0 +1,187 @@
+# ===========================================
+# HEADLESS TRAINING - Command Line Entry Point
+# ===========================================
+
+import argparse
+import time
+from config import (MAX_TICKS_PER_GENERATION, MAX_PIPES_PER_GENERATION, PLATEAU_GENERATIONS, SOLVED_SCORE,
+                    SELECTION, EVALUATION_COURSES, FITNESS_AGGREGATE, FITNESS_QUANTILE)
+from simulator import Trainer
+from islands import IslandModel
+from neural_network import NeuralNetwork
+from archive import GenomeArchive
+from profiler import PhaseTimer, PHASES
+from stats_publisher import StatsPublisher
+from selection import SELECTIONS
+from multi_course import AGGREGATES
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Train Flappy Bird AI without a window")
+    parser.add_argument("--generations", type=int, default=100,
+                        help="number of generations to evolve")
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS_PER_GENERATION,
+                        help="stop a generation after this many ticks")
+    parser.add_argument("--max-pipes", type=int, default=MAX_PIPES_PER_GENERATION,
+                        help="stop a generation once a bird passes this many pipes")
+    parser.add_argument("--plateau", type=int, default=PLATEAU_GENERATIONS,
+                        help="stop training when the best fitness has not improved for this many generations")
+    parser.add_argument("--solved-score", type=int, default=SOLVED_SCORE,
+                        help="stop training and save the champion once a bird reaches this score")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for a reproducible run")
+    parser.add_argument("--selection", choices=sorted(SELECTIONS), default=None,
+                        help=f"parent selection operator (default: {SELECTION}, or the checkpoint's with --resume)")
+    parser.add_argument("--courses", type=int, default=EVALUATION_COURSES,
+                        help="seeded courses every genome is evaluated on per generation")
+    parser.add_argument("--aggregate", choices=AGGREGATES, default=FITNESS_AGGREGATE,
+                        help="how fitness over several courses is combined")
+    parser.add_argument("--quantile", type=float, default=FITNESS_QUANTILE,
+                        help="quantile used by --aggregate quantile")
+    parser.add_argument("--decision-interval", type=int, default=1,
+                        help="let birds decide only every N ticks and fast-forward in between")
+    parser.add_argument("--jit", action="store_true",
+                        help="simulate each generation in one compiled loop (needs numba)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for fitness evaluation (0 = all cores)")
+    parser.add_argument("--islands", type=int, default=1,
+                        help="evolve this many sub-populations in separate processes")
+    parser.add_argument("--migration-interval", type=int, default=10,
+                        help="generations between island migrations")
+    parser.add_argument("--migrants", type=int, default=2,
+                        help="genomes each island sends per migration")
+    parser.add_argument("--checkpoint", default=None,
+                        help="write a checkpoint (.npz) to this file while training")
+    parser.add_argument("--checkpoint-every", type=int, default=10,
+                        help="generations between checkpoints")
+    parser.add_argument("--resume", default=None,
+                        help="continue training from a checkpoint file")
+    parser.add_argument("--archive", default=None,
+                        help="directory of an archive that stores every generation's genomes")
+    parser.add_argument("--reseed", type=int, default=None,
+                        help="start from the genomes archived for this generation (needs --archive)")
+    parser.add_argument("--save", default="best_brain.json",
+                        help="where to save the best brain when training ends")
+    parser.add_argument("--profile", default=None,
+                        help="time each phase of every generation and write it to this CSV file")
+    parser.add_argument("--stats", default=None,
+                        help="write per-generation statistics to this CSV file")
+    parser.add_argument("--plot", default=None,
+                        help="save a matplotlib fitness plot to this image file")
+    parser.add_argument("--quiet", action="store_true",
+                        help="only print the final summary")
+    args = parser.parse_args()
+
+    # The islands evolve in their own processes, one course each, and only report progress back
+    if args.islands > 1:
+        unsupported = [flag for flag, used in (
+            ("--workers", args.workers != 1), ("--courses", args.courses > 1),
+            ("--checkpoint", args.checkpoint), ("--resume", args.resume),
+            ("--archive", args.archive), ("--reseed", args.reseed is not None),
+            ("--profile", args.profile), ("--stats", args.stats), ("--plot", args.plot)) if used]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be combined with --islands")
+    return args
+
+
+def train_islands(args):
+    model = IslandModel(args.islands, args.migration_interval, args.migrants,
+                        seed=args.seed, decision_interval=args.decision_interval,
+                        selection=args.selection or SELECTION,
+                        jit=args.jit)
+
+    def report(island, stats):
+        if not args.quiet:
+            print(f"Island {island} generation {stats['generation']} complete! "
+                  f"Best fitness: {stats['best_fitness']}  "
+                  f"Avg: {stats['avg_fitness']:.1f}  "
+                  f"Score: {stats['best_score']}"
+                  + ("" if stats['termination'] == 'extinct' else f"  (capped: {stats['termination']})"))
+
+    start = time.perf_counter()
+    best_genome, best_fitness = model.run(args.generations, max_ticks=args.max_ticks, max_pipes=args.max_pipes,
+                                          plateau=args.plateau, solved_score=args.solved_score, callback=report)
+    elapsed = time.perf_counter() - start
+
+    print(f"Trained {args.islands} islands x up to {args.generations} generations in {elapsed:.1f}s, "
+          f"stopped: {model.stop_reason}")
+    if best_genome is not None:
+        print(f"Best ever: {best_fitness}")
+        NeuralNetwork(best_genome).save(args.save)
+
+
+def main():
+    args = parse_args()
+    if args.islands > 1:
+        train_islands(args)
+        return
+
+    archive = GenomeArchive(args.archive) if args.archive else None
+    timer = PhaseTimer(enabled=True, csv_path=args.profile) if args.profile else None
+    trainer = Trainer(workers=args.workers or None, seed=args.seed,
+                      decision_interval=args.decision_interval, archive=archive, timer=timer,
+                      selection=args.selection or SELECTION, courses=args.courses,
+                      fitness_aggregate=args.aggregate, fitness_quantile=args.quantile, jit=args.jit)
+    if args.resume:
+        trainer.resume(args.resume)
+        print(f"Resumed from {args.resume} at generation {trainer.ga.generation}")
+        # The checkpoint brings its own selection operator; an explicit --selection wins
+        if args.selection and args.selection != trainer.ga.selection_method:
+            print(f"Selection switched from {trainer.ga.selection_method} to {args.selection}")
+            trainer.ga.selection_method = args.selection
+            trainer.ga.selection_options = {}
+    if args.reseed is not None:
+        trainer.reseed(args.reseed)
+        print(f"Reseeded from archived generation {args.reseed}")
+
+    profile = {}
+    publisher = StatsPublisher(args.stats, args.plot) if args.stats or args.plot else None
+
+    def report(stats):
+        if publisher:
+            publisher.publish(stats)
+        for name, seconds in stats['profile'].items():
+            profile[name] = profile.get(name, 0.0) + seconds
+        if args.checkpoint and trainer.ga.generation % args.checkpoint_every == 0:
+            trainer.save(args.checkpoint)
+        if not args.quiet:
+            print(f"Generation {stats['generation']} complete! "
+                  f"Best fitness: {stats['best_fitness']}  "
+                  f"Avg: {stats['avg_fitness']:.1f}  "
+                  f"Score: {stats['best_score']}"
+                  + ("" if stats['termination'] == 'extinct' else f"  (capped: {stats['termination']})"))
+
+    start_generation = trainer.ga.generation
+    start = time.perf_counter()
+    try:
+        stats = trainer.train(args.generations, max_ticks=args.max_ticks, max_pipes=args.max_pipes,
+                              plateau=args.plateau, solved_score=args.solved_score, callback=report)
+    finally:
+        trainer.close()
+        if publisher:
+            publisher.close()
+        if timer is not None:
+            timer.close()
+        if args.checkpoint:
+            trainer.save(args.checkpoint)
+            print(f"Checkpoint saved to {args.checkpoint}")
+    elapsed = time.perf_counter() - start
+
+    # The histories also hold the generations of a resumed checkpoint
+    generations = trainer.ga.generation - start_generation
+    terminations = stats['termination_history'][len(stats['termination_history']) - generations:]
+    capped = sum(1 for termination in terminations if termination != 'extinct')
+    print(f"Trained {generations} generations in {elapsed:.1f}s "
+          f"({generations / elapsed:.1f} gen/s), stopped: {trainer.stop_reason}, "
+          f"capped generations: {capped}")
+    if profile:
+        print("Time per phase: " + "  ".join(f"{name} {profile[name]:.2f}s"
+                                             for name in PHASES if name in profile))
+        print(f"Profile written to {args.profile}")
+    if trainer.champion is not None:
+        print(f"Best ever: {trainer.champion_fitness}")
+        NeuralNetwork(trainer.champion).save(args.save)
+
+
+if __name__ == "__main__":
+    main()